@@ -1,11 +1,22 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
+import json
 import os
+import uuid
 from werkzeug.utils import secure_filename
-from .resume_parser import ResumeParser
 from .skill_extractor import SkillExtractor
+from .skill_taxonomy import TaxonomyStore
 from .job_matcher import JobMatcher
+from .batch_match import batch_results, is_content_hash
+from .candidate_index import CandidateIndex
+from .job_catalog import JobCatalogStore
+from .match_cache import MatchCache
 from .database import Database
+from .parse_cache import ParseCache, hash_file
+from .parse_executor import ParseExecutor, ParseError
+from .upload_stream import read_upload_stream, AsyncUploadWriter
+from .upload_store import UploadStore
+from .task_queue import TaskQueue, TaskWorkers, release_spool
 from .config import Config
 from .auth import hash_password, verify_password, generate_token, verify_token, require_auth, require_admin
 
@@ -24,16 +35,90 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
 # Initialize components
 db = Database()
-resume_parser = ResumeParser()
-skill_extractor = SkillExtractor()
-job_matcher = JobMatcher()
+taxonomy_store = TaxonomyStore(check_interval=Config.TAXONOMY_CHECK_INTERVAL)
+skill_extractor = SkillExtractor(
+    spacy_model=Config.SPACY_MODEL,
+    max_nlp_chars=Config.SPACY_MAX_CHARS,
+    nlp_batch_size=Config.SPACY_BATCH_SIZE,
+    nlp_n_process=Config.SPACY_N_PROCESS,
+    taxonomy_store=taxonomy_store
+)
+job_matcher = JobMatcher(taxonomy_store=taxonomy_store)
+job_catalog_store = JobCatalogStore(
+    db, taxonomy_store,
+    lsh_bands=Config.MATCH_LSH_BANDS,
+    lsh_rows=Config.MATCH_LSH_ROWS,
+    lsh_min_jobs=Config.MATCH_LSH_MIN_JOBS
+)
+parse_cache = ParseCache(db, max_entries=Config.PARSE_CACHE_SIZE)
+match_cache = MatchCache(max_entries=Config.MATCH_CACHE_SIZE)
+candidate_index = CandidateIndex(db, taxonomy_store)
+parse_executor = ParseExecutor(
+    pool_size=Config.PARSE_POOL_SIZE,
+    timeout=Config.PARSE_TIMEOUT,
+    max_pages=Config.PARSE_MAX_PAGES,
+    max_tasks_per_worker=Config.PARSE_WORKER_MAX_TASKS,
+    page_parallel_threshold=Config.PAGE_PARALLEL_THRESHOLD,
+    backend=Config.PDF_TEXT_BACKEND
+)
+upload_writer = AsyncUploadWriter()
+upload_store = UploadStore(upload_path, db, upload_writer, persist=Config.PERSIST_UPLOADS)
+task_queue = TaskQueue(db, stale_after=Config.TASK_STALE_AFTER, max_attempts=Config.TASK_MAX_ATTEMPTS)
+task_workers = TaskWorkers(
+    db.db_path,
+    count=Config.TASK_WORKERS,
+    poll_interval=Config.TASK_POLL_INTERVAL,
+    stale_after=Config.TASK_STALE_AFTER,
+    max_attempts=Config.TASK_MAX_ATTEMPTS
+)
 
-# Ensure upload directory exists
+# Ensure upload directories exist (.tasks holds uploads waiting for a task worker)
 os.makedirs(upload_path, exist_ok=True)
+task_spool_path = os.path.join(upload_path, '.tasks')
+os.makedirs(task_spool_path, exist_ok=True)
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def get_cached_resume(content_hash):
+    """
+    Cached parse result for a content hash, or None on a miss
+    
+    Entries whose skills came from an older taxonomy are re-extracted from
+    the cached text; the PDF is not parsed again.
+    """
+    cached = parse_cache.get(content_hash)
+    if cached is None:
+        return None
+    
+    taxonomy = taxonomy_store.current()
+    if cached['taxonomy_fingerprint'] == taxonomy.fingerprint:
+        return cached
+    
+    skills = skill_extractor.extract_skills(cached['text'], cached['section_spans'])
+    return parse_cache.put(content_hash, cached['text'], cached['sections'], cached['section_spans'],
+                           skills, taxonomy.fingerprint)
+
+def get_parsed_resume(source, content_hash=None):
+    """
+    Parse a resume and extract skills, reusing the cached result for identical PDFs
+    
+    Args:
+        source: Path to the PDF file, or the raw PDF bytes
+        content_hash: SHA-256 of the PDF bytes, if already known
+    """
+    if content_hash is None:
+        content_hash = hash_file(source)
+    cached = get_cached_resume(content_hash)
+    if cached:
+        return cached
+    
+    parsed = parse_executor.parse(source)
+    taxonomy = taxonomy_store.current()
+    skills = skill_extractor.extract_skills(parsed.text, parsed.section_spans)
+    return parse_cache.put(content_hash, parsed.text, parsed.sections, parsed.section_spans,
+                           skills, taxonomy.fingerprint)
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -138,6 +223,258 @@ def get_current_user():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def wants_async():
+    """Whether the client asked for a background task (?async=true or an async field)"""
+    value = request.args.get('async') or request.form.get('async')
+    if value is None and request.is_json:
+        value = (request.get_json(silent=True) or {}).get('async')
+    if value is None:
+        return Config.ASYNC_TASKS
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def enqueue_task(kind, payload):
+    """Queue a background task and return the 202 response for it"""
+    if Config.TASK_WORKERS:
+        task_workers.ensure_started()
+    task_id = task_queue.enqueue(kind, payload)
+    return jsonify({
+        'success': True,
+        'task_id': task_id,
+        'status': 'queued',
+        'status_url': f'/api/tasks/{task_id}'
+    }), 202
+
+def process_upload(source, content_hash, filename, upload_id):
+    """
+    Parse an uploaded resume and extract its skills
+    
+    Returns:
+        (response body, HTTP status code)
+    """
+    try:
+        # Parse resume and extract skills (cached by content hash)
+        skills = get_parsed_resume(source, content_hash)['skills']
+        
+        return {
+            'success': True,
+            'upload_id': upload_id,
+            'filename': filename,
+            'content_hash': content_hash,
+            'skills': skills,
+            'skill_count': len(skills),
+            'message': 'Resume uploaded and parsed successfully'
+        }, 200
+    
+    except ParseError as e:
+        return {'error': str(e)}, e.status_code
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+def load_resume(upload_id=None, filename=None, content_hash=None):
+    """
+    Parsed resume for an upload id (preferred), content hash, or the
+    filename of a file saved before uploads were content-addressed
+    
+    Returns:
+        (parse cache entry, filename or None)
+    
+    Raises:
+        LookupError: If the upload or its file does not exist
+        ParseError: If the PDF cannot be parsed
+    """
+    if upload_id:
+        upload = upload_store.get(upload_id)
+        if not upload:
+            raise LookupError('Upload not found')
+        content_hash = upload['content_hash']
+        filename = upload['filename']
+    
+    # A known content hash resolves straight from the parse cache, no disk needed
+    parsed = get_cached_resume(content_hash) if content_hash else None
+    if parsed is not None:
+        return parsed, filename
+    
+    if content_hash:
+        filepath = upload_store.open_path(content_hash)
+    elif filename:
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], secure_filename(filename))
+        if not os.path.isfile(filepath):
+            filepath = None
+    else:
+        filepath = None
+    if not filepath:
+        raise LookupError('File not found')
+    return get_parsed_resume(filepath, content_hash), filename
+
+def page_params(source):
+    """
+    offset, limit and min_score of a match request
+    
+    Args:
+        source: Mapping holding the parameters (JSON body or query args)
+    
+    Returns:
+        (offset, limit, min_score)
+    
+    Raises:
+        ValueError: If a parameter is not a valid number
+    """
+    try:
+        offset = int(source.get('offset') or 0)
+        limit = int(source.get('limit') or Config.MATCH_PAGE_SIZE)
+        min_score = source.get('min_score')
+        min_score = float(min_score) if min_score not in (None, '') else None
+    except (TypeError, ValueError):
+        raise ValueError('offset and limit must be integers, min_score a number')
+    if offset < 0 or limit < 1:
+        raise ValueError('offset must be >= 0 and limit >= 1')
+    return offset, min(limit, Config.MATCH_MAX_PAGE_SIZE), min_score
+
+def company_param(source):
+    """
+    company_id filter of a match request, as an int (None means all companies)
+    
+    The job catalog keys companies by integer id, so JSON strings such as
+    "1" are converted here once rather than compared as-is.
+    
+    Raises:
+        ValueError: If company_id is not an integer
+    """
+    company_id = source.get('company_id')
+    if company_id in (None, ''):
+        return None
+    if isinstance(company_id, bool) or (isinstance(company_id, float) and not company_id.is_integer()):
+        raise ValueError('company_id must be an integer')
+    try:
+        return int(company_id)
+    except (TypeError, ValueError):
+        raise ValueError('company_id must be an integer')
+
+def match_page(skills, catalog, company_id, offset, limit, min_score):
+    """
+    One page of job matches with improvement tips and company info
+    
+    Only the best offset + limit jobs are selected, and result dicts are
+    built for the page alone. Rankings are cached per skill set, filters
+    and catalog version, so repeat analyses skip scoring.
+    
+    Returns:
+        (matches, number of jobs scoring at least min_score)
+    """
+    top_k = offset + limit
+    canonicalize = job_matcher.skill_index.canonicalize
+    cache_key = match_cache.key((canonicalize(s) for s in skills), company_id, min_score, catalog)
+    cached = match_cache.get(cache_key, catalog, top_k)
+    if cached is None:
+        cached = job_matcher.rank_catalog(skills, catalog, company_id, min_score, top_k=top_k)
+        match_cache.put(cache_key, catalog, *cached)
+    ranked, total_matches = cached
+    matches = job_matcher.build_matches(skills, catalog, ranked[offset:])
+    
+    # Add improvement tips and company info to each match
+    for match in matches:
+        missing_skills = match['missing_required_skills'] + match['missing_preferred_skills']
+        match['improvement_tips'] = job_matcher.generate_improvement_tips(
+            missing_skills, match['job_title']
+        )
+        # Add company info from job data
+        job_data = catalog.jobs_by_id[match['job_id']].job
+        match['company_name'] = job_data.get('company_name', 'Unknown')
+        match['company_logo'] = job_data.get('company_logo')
+        match['company_website'] = job_data.get('company_website')
+    return matches, total_matches
+
+def process_analysis(upload_id, filename, content_hash, company_id, offset=0,
+                     limit=Config.MATCH_PAGE_SIZE, min_score=None):
+    """
+    Match a resume against the job catalog and save the analysis
+    
+    The resume is identified by upload_id (preferred), content_hash, or
+    the filename of a file saved before uploads were content-addressed.
+    Only one page of matches is returned and stored; later pages come
+    from GET /api/analyses/<analysis_id>/matches.
+    
+    Returns:
+        (response body, HTTP status code)
+    """
+    try:
+        # Parse resume and extract skills (cached by content hash)
+        parsed, filename = load_resume(upload_id, filename, content_hash)
+    except LookupError as e:
+        return {'error': str(e)}, 404
+    except ParseError as e:
+        return {'error': str(e)}, e.status_code
+    except Exception as e:
+        return {'error': str(e)}, 500
+    
+    try:
+        skills = parsed['skills']
+        
+        # Current job catalog snapshot (rebuilt only after admin edits)
+        catalog = job_catalog_store.current()
+        total_jobs = catalog.job_count(company_id)
+        
+        if not total_jobs:
+            return {
+                'error': f'No jobs found{" for selected company" if company_id else ""}. Please add jobs in the Admin Panel.'
+            }, 404
+        
+        # Top matches among jobs sharing at least one skill (filtered by company if specified)
+        matches, total_matches = match_page(skills, catalog, company_id, offset, limit, min_score)
+        
+        # Save analysis; the skills and filters are enough to page through the rest
+        analysis_result = {
+            'skills': skills,
+            'matches': matches,
+            'total_jobs': total_jobs,
+            'total_matches': total_matches,
+            'company_id': company_id,
+            'min_score': min_score,
+            'catalog_version': catalog.version
+        }
+        analysis_id = db.save_analysis(filename or parsed['content_hash'], skills, analysis_result,
+                                       content_hash=parsed['content_hash'])
+        
+        return {
+            'success': True,
+            'analysis_id': analysis_id,
+            'extracted_skills': skills,
+            'matches': matches,
+            'total_jobs_analyzed': total_jobs,
+            'total_matches': total_matches,
+            'offset': offset,
+            'limit': limit
+        }, 200
+    
+    except ParseError as e:
+        return {'error': str(e)}, e.status_code
+    except Exception as e:
+        return {'error': str(e)}, 500
+
+def run_task(kind, payload):
+    """
+    Run one background task (called by task_queue workers)
+    
+    Returns:
+        (result body, HTTP status code), as the synchronous endpoint would respond
+    """
+    if kind == 'upload':
+        try:
+            return process_upload(payload['path'], payload['content_hash'], payload['filename'],
+                                  payload['upload_id'])
+        finally:
+            release_spool(kind, payload)
+    if kind == 'analyze':
+        try:
+            company_id = company_param(payload)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return process_analysis(payload.get('upload_id'), payload.get('filename'),
+                                payload.get('content_hash'), company_id,
+                                payload.get('offset', 0), payload.get('limit', Config.MATCH_PAGE_SIZE),
+                                payload.get('min_score'))
+    return {'error': f'Unknown task kind: {kind}'}, 400
+
 @app.route('/api/upload', methods=['POST'])
 def upload_resume():
     """Upload and parse resume PDF"""
@@ -154,22 +491,32 @@ def upload_resume():
     
     try:
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
         
-        # Parse resume
-        resume_text = resume_parser.parse_pdf(filepath)
+        # Read the upload into memory, hashing it on the way in
+        data, content_hash = read_upload_stream(file.stream)
         
-        # Extract skills
-        skills = skill_extractor.extract_skills(resume_text)
+        # Stored once per distinct PDF, in the background; parsing does not wait for it
+        upload_id = upload_store.put(data, content_hash, filename)
         
-        return jsonify({
-            'success': True,
-            'filename': filename,
-            'skills': skills,
-            'skill_count': len(skills),
-            'message': 'Resume uploaded and parsed successfully'
-        })
+        if wants_async():
+            # The task worker reads the PDF from disk, so it must be written before queueing
+            spooled = not Config.PERSIST_UPLOADS
+            if spooled:
+                filepath = os.path.join(task_spool_path, f'{uuid.uuid4().hex}.pdf')
+                upload_writer.write(filepath, data)
+                upload_writer.wait(filepath)
+            else:
+                filepath = upload_store.open_path(content_hash)
+            return enqueue_task('upload', {
+                'path': filepath,
+                'filename': filename,
+                'content_hash': content_hash,
+                'upload_id': upload_id,
+                'spooled': spooled
+            })
+        
+        body, status_code = process_upload(data, content_hash, filename, upload_id)
+        return jsonify(body), status_code
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -179,66 +526,207 @@ def analyze_resume():
     """Analyze resume and match with jobs"""
     data = request.get_json()
     
-    if not data or 'filename' not in data:
-        return jsonify({'error': 'Filename required'}), 400
+    if not data or not (data.get('upload_id') or data.get('filename') or data.get('content_hash')):
+        return jsonify({'error': 'upload_id required'}), 400
+    
+    upload_id = data.get('upload_id')
+    filename = data.get('filename')
+    content_hash = data.get('content_hash')
+    try:
+        company_id = company_param(data)  # None means all companies
+        offset, limit, min_score = page_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if wants_async():
+        # Make sure a pending background write has landed before a worker looks for it
+        upload = upload_store.get(upload_id) if upload_id else None
+        if upload or content_hash:
+            upload_store.open_path(upload['content_hash'] if upload else content_hash)
+        return enqueue_task('analyze', {
+            'upload_id': upload_id,
+            'filename': filename,
+            'content_hash': content_hash,
+            'company_id': company_id,
+            'offset': offset,
+            'limit': limit,
+            'min_score': min_score
+        })
     
-    filename = data['filename']
-    company_id = data.get('company_id')  # None means all companies
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    body, status_code = process_analysis(upload_id, filename, content_hash, company_id,
+                                         offset, limit, min_score)
+    return jsonify(body), status_code
+
+@app.route('/api/analyses/<int:analysis_id>/matches', methods=['GET'])
+def get_analysis_matches(analysis_id):
+    """
+    A page of job matches for a saved analysis (?offset=&limit=)
     
-    if not os.path.exists(filepath):
-        return jsonify({'error': 'File not found'}), 404
+    The page is ranked from the analysis' stored skills and filters against
+    the current job catalog; catalog_changed tells whether jobs were edited
+    since the analysis was made.
+    """
+    try:
+        offset, limit, _ = page_params(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     try:
-        # Parse resume
-        resume_text = resume_parser.parse_pdf(filepath)
+        analysis = db.get_analysis(analysis_id)
+        if not analysis:
+            return jsonify({'error': 'Analysis not found'}), 404
         
-        # Extract skills
-        skills = skill_extractor.extract_skills(resume_text)
+        result = analysis['analysis_result']
+        skills = result.get('skills', analysis['extracted_skills'])
+        company_id = result.get('company_id')
+        min_score = result.get('min_score')
         
-        # Get jobs (filtered by company if specified)
-        jobs = db.get_all_jobs(company_id=company_id)
+        catalog = job_catalog_store.current()
+        matches, total_matches = match_page(skills, catalog, company_id, offset, limit, min_score)
         
-        if not jobs:
-            return jsonify({
-                'error': f'No jobs found{" for selected company" if company_id else ""}. Please add jobs in the Admin Panel.'
-            }), 404
+        return jsonify({
+            'success': True,
+            'analysis_id': analysis_id,
+            'matches': matches,
+            'total_matches': total_matches,
+            'offset': offset,
+            'limit': limit,
+            'catalog_changed': result.get('catalog_version') != catalog.version
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/match/batch', methods=['POST'])
+@require_admin
+def match_batch():
+    """
+    Score many resumes against the job catalog in one pass
+    
+    JSON body: resumes (upload ids or content hashes), optional company_id,
+    limit (jobs per resume) and min_score. The response streams NDJSON:
+    one line per resume with its top jobs, then a summary line with the
+    number of resume x job pairs scored per second.
+    """
+    data = request.get_json()
+    handles = (data or {}).get('resumes')
+    if not handles or not isinstance(handles, list):
+        return jsonify({'error': 'resumes (a list of upload ids or content hashes) required'}), 400
+    if len(handles) > Config.BATCH_MAX_RESUMES:
+        return jsonify({'error': f'At most {Config.BATCH_MAX_RESUMES} resumes per batch'}), 400
+    try:
+        company_id = company_param(data)
+        _, limit, min_score = page_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        resumes = []
+        for handle in handles:
+            handle = str(handle)
+            try:
+                if is_content_hash(handle):
+                    parsed, _ = load_resume(content_hash=handle)
+                else:
+                    parsed, _ = load_resume(upload_id=handle)
+                resumes.append({'resume': handle, 'skills': parsed['skills']})
+            except (LookupError, ParseError) as e:
+                resumes.append({'resume': handle, 'error': str(e)})
         
-        # Match with jobs
-        matches = job_matcher.match_with_all_jobs(skills, jobs)
+        catalog = job_catalog_store.current()
+        if not catalog.job_count(company_id):
+            return jsonify({'error': f'No jobs found{" for selected company" if company_id else ""}'}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    lines = batch_results(job_matcher, catalog, resumes, company_id, limit, min_score)
+    return Response((json.dumps(line) + '\n' for line in lines), mimetype='application/x-ndjson')
+
+@app.route('/api/analyze/<int:analysis_id>/whatif', methods=['POST'])
+def whatif_analysis(analysis_id):
+    """
+    How match scores change if skills are added to or removed from an analyzed resume
+    
+    JSON body: add and/or remove (lists of skills), optional limit. Every
+    job sharing a skill with the old or new skill set is re-scored from the
+    analysis' stored skills and the in-memory job catalog (nothing is parsed
+    again); jobs whose score changes are returned with a status of changed,
+    added (newly matching) or removed (no longer matching).
+    """
+    data = request.get_json() or {}
+    add = data.get('add') or []
+    remove = data.get('remove') or []
+    if not isinstance(add, list) or not isinstance(remove, list) \
+            or not all(isinstance(s, str) for s in add + remove):
+        return jsonify({'error': 'add and remove must be lists of skills'}), 400
+    if not add and not remove:
+        return jsonify({'error': 'add or remove required'}), 400
+    try:
+        _, limit, _ = page_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        analysis = db.get_analysis(analysis_id)
+        if not analysis:
+            return jsonify({'error': 'Analysis not found'}), 404
+        result = analysis['analysis_result']
+        skills = result.get('skills', analysis['extracted_skills'])
         
-        # Add improvement tips and company info to each match
-        for match in matches:
-            missing_skills = match['missing_required_skills'] + match['missing_preferred_skills']
-            match['improvement_tips'] = job_matcher.generate_improvement_tips(
-                missing_skills, match['job_title']
-            )
-            # Add company info from job data
-            job_data = next((j for j in jobs if j['id'] == match['job_id']), None)
-            if job_data:
-                match['company_name'] = job_data.get('company_name', 'Unknown')
-                match['company_logo'] = job_data.get('company_logo')
-                match['company_website'] = job_data.get('company_website')
-        
-        # Save analysis
-        analysis_result = {
-            'skills': skills,
-            'matches': matches,
-            'total_jobs': len(jobs),
-            'company_id': company_id
-        }
-        db.save_analysis(filename, skills, analysis_result)
+        catalog = job_catalog_store.current()
+        new_skills, changes = job_matcher.rescore_whatif(skills, catalog, add, remove, result.get('company_id'))
+        # Changed jobs by gain, then newly matching jobs, then jobs that would drop out
+        status_order = {'changed': 0, 'added': 1, 'removed': 2}
+        changes.sort(key=lambda match: (status_order[match['status']], -(match['score_delta'] or 0),
+                                        -(match['match_score'] if match['match_score'] is not None
+                                          else match['previous_score'])))
         
         return jsonify({
             'success': True,
-            'extracted_skills': skills,
-            'matches': matches,
-            'total_jobs_analyzed': len(jobs)
+            'analysis_id': analysis_id,
+            'skills': new_skills,
+            'affected_jobs': len(changes),
+            'changes': changes[:limit],
+            'limit': limit
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def delete_upload(upload_id):
+    """Release an upload; the stored PDF is removed with its last upload"""
+    try:
+        if not upload_store.release(upload_id):
+            return jsonify({'error': 'Upload not found'}), 404
+        return jsonify({
+            'success': True,
+            'message': 'Upload deleted successfully'
         })
-    
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/tasks/<task_id>', methods=['GET'])
+def get_task_status(task_id):
+    """Status of a background upload or analysis, with its result once finished"""
+    task = task_queue.get(task_id)
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    response = {
+        'task_id': task['id'],
+        'kind': task['kind'],
+        'status': task['status'],
+        'attempts': task['attempts'],
+        'created_at': task['created_at'],
+        'started_at': task['started_at'],
+        'finished_at': task['finished_at']
+    }
+    if task['status'] == 'done':
+        response['result'] = task['result']
+    elif task['status'] == 'failed':
+        response['error'] = (task['result'] or {}).get('error')
+        response['status_code'] = task['status_code']
+    return jsonify(response)
+
 # Company endpoints (public - anyone can view)
 @app.route('/api/companies', methods=['GET'])
 def get_companies():
@@ -375,6 +863,43 @@ def get_job(job_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<int:job_id>/candidates', methods=['GET'])
+@require_admin
+def get_job_candidates(job_id):
+    """
+    Rank analyzed resumes for a job (?offset=&limit=&min_score=)
+    
+    Candidates are scored from the skills stored with their analyses, the
+    same way /api/analyze scores jobs, so no PDF is parsed again.
+    """
+    try:
+        offset, limit, min_score = page_params(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        job = db.get_job_by_id(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        # Analyses saved since the last request are indexed first
+        pool = candidate_index.current()
+        catalog = job_catalog_store.current()
+        ranked, total_matches = job_matcher.rank_candidates(job, pool, catalog, min_score, top_k=offset + limit)
+        candidates = job_matcher.build_candidate_matches(job, pool, ranked[offset:])
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'candidates': candidates,
+            'total_candidates': len(pool),
+            'total_matches': total_matches,
+            'offset': offset,
+            'limit': limit
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/jobs/<int:job_id>', methods=['PUT'])
 @require_admin
 def update_job(job_id):
@@ -411,6 +936,22 @@ def delete_job(job_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/taxonomy/reload', methods=['POST'])
+@require_admin
+def reload_taxonomy():
+    """Load the current skill taxonomy from disk without restarting"""
+    try:
+        taxonomy = taxonomy_store.reload()
+        return jsonify({
+            'success': True,
+            'version': taxonomy.version,
+            'fingerprint': taxonomy.fingerprint,
+            'skill_count': taxonomy.skill_count,
+            'message': 'Skill taxonomy reloaded successfully'
+        })
+    except Exception as e:
+        return jsonify({'error': f"Error loading skill taxonomy: {str(e)}"}), 500
+
 if __name__ == '__main__':
     print("Starting AI Resume Analyzer API...")
     print("Note: SpaCy is optional. Skill extraction works without it, but NLP features are enhanced if SpaCy is installed.")
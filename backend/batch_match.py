@@ -0,0 +1,142 @@
+"""
+Many-to-many matching: score a batch of resumes against the job catalog
+
+Used by POST /api/match/batch and from the command line:
+
+    python -m backend.batch_match resumes/ --top-k 10 > matches.ndjson
+    python -m backend.batch_match <upload_id> <content_hash> ... --company-id 3
+
+Targets are PDF files, directories or glob patterns, or upload ids and
+content hashes of resumes already uploaded. Results are written as
+NDJSON, one line per resume with its top-K jobs, followed by a summary
+line with the scoring throughput in resume x job pairs per second.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+from .config import Config
+from .ingest import find_pdfs
+
+CONTENT_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# Fields of a match kept in batch results
+BATCH_MATCH_FIELDS = (
+    'job_id', 'job_title', 'company_id', 'company_name', 'match_score',
+    'required_score', 'preferred_score', 'missing_required_skills'
+)
+
+def is_content_hash(handle: str) -> bool:
+    """Whether a resume handle is a content hash rather than an upload id"""
+    return bool(CONTENT_HASH_PATTERN.match(handle))
+
+def batch_results(matcher, catalog, resumes: List[Dict], company_id: Optional[int] = None,
+                  top_k: Optional[int] = 10, min_score: Optional[float] = None,
+                  max_cells: int = Config.BATCH_MAX_CELLS) -> Iterator[Dict]:
+    """
+    Score resumes against a catalog snapshot and yield one result per resume
+
+    Args:
+        matcher: JobMatcher used for scoring
+        catalog: JobCatalog snapshot to match against
+        resumes: {'resume': handle, 'skills': [...]} for resolved resumes, or
+            {'resume': handle, 'error': message} for ones that failed
+        company_id: Only match jobs of this company
+        top_k: Jobs returned per resume (None for all)
+        min_score: Only return jobs scoring at least this much
+        max_cells: Resume x job cells scored per chunk, bounding memory
+
+    Yields:
+        {'resume', 'total_matches', 'matches'} or {'resume', 'error'} per
+        resume in input order, then {'summary': {...}} with the throughput
+    """
+    scored = [resume for resume in resumes if 'error' not in resume]
+    job_count = catalog.job_count(company_id)
+    started = time.perf_counter()
+
+    rankings = matcher.rank_batch([resume['skills'] for resume in scored], catalog,
+                                  company_id, min_score, top_k, max_cells)
+    for resume in resumes:
+        if 'error' in resume:
+            yield {'resume': resume['resume'], 'error': resume['error']}
+            continue
+        ranked, total = next(rankings)
+        matches = matcher.build_matches(resume['skills'], catalog, ranked)
+        yield {
+            'resume': resume['resume'],
+            'total_matches': total,
+            'matches': [{field: match[field] for field in BATCH_MATCH_FIELDS} for match in matches]
+        }
+
+    elapsed = time.perf_counter() - started
+    pairs = len(scored) * job_count
+    yield {'summary': {
+        'resumes': len(resumes),
+        'failed': len(resumes) - len(scored),
+        'jobs': job_count,
+        'pairs': pairs,
+        'seconds': round(elapsed, 4),
+        'pairs_per_second': round(pairs / elapsed) if elapsed else None
+    }}
+
+def _resolve(handles: List[str], app_module) -> List[Dict]:
+    """Skills for each PDF path, upload id or content hash"""
+    resumes = []
+    for handle in handles:
+        try:
+            if os.path.isfile(handle):
+                parsed = app_module.get_parsed_resume(handle)
+            elif is_content_hash(handle):
+                parsed, _ = app_module.load_resume(content_hash=handle)
+            else:
+                parsed, _ = app_module.load_resume(upload_id=handle)
+            resumes.append({'resume': handle, 'skills': parsed['skills']})
+        except Exception as e:
+            resumes.append({'resume': handle, 'error': str(e) or e.__class__.__name__})
+    return resumes
+
+def main():
+    parser = argparse.ArgumentParser(description='Score many resumes against the job catalog')
+    parser.add_argument('targets', nargs='+',
+                        help='PDF files, directories or glob patterns, upload ids or content hashes')
+    parser.add_argument('--company-id', type=int, default=None, help='Only match jobs of this company')
+    parser.add_argument('--top-k', type=int, default=10, help='Jobs per resume (default: 10, 0 for all)')
+    parser.add_argument('--min-score', type=float, default=None, help='Only report jobs scoring at least this')
+    parser.add_argument('--output', default=None, help='Write NDJSON here instead of stdout')
+
+    args = parser.parse_args()
+    handles = []
+    for target in args.targets:
+        pdfs = find_pdfs(target) if os.path.isdir(target) or not os.path.exists(target) else [target]
+        handles.extend(pdfs or [target])
+
+    # The app module holds the parse cache, upload store and catalog this process uses
+    from . import app as app_module
+    started = time.perf_counter()
+    resumes = _resolve(handles, app_module)
+    resolve_seconds = time.perf_counter() - started
+
+    catalog = app_module.job_catalog_store.current()
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for line in batch_results(app_module.job_matcher, catalog, resumes, args.company_id,
+                                  args.top_k or None, args.min_score):
+            out.write(json.dumps(line) + '\n')
+            summary = line.get('summary')
+    finally:
+        if args.output:
+            out.close()
+
+    print(f"Resumes: {summary['resumes']}  failed: {summary['failed']}  jobs: {summary['jobs']}", file=sys.stderr)
+    print(f"Resolved/parsed resumes in {resolve_seconds:.2f}s", file=sys.stderr)
+    print(f"Scored {summary['pairs']} pairs in {summary['seconds']:.3f}s "
+          f"({summary['pairs_per_second'] or 0} pairs/sec)", file=sys.stderr)
+    if summary['failed'] and summary['failed'] == summary['resumes']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,240 @@
+"""
+Benchmarks for the resume processing pipeline
+
+Usage:
+    python -m backend.benchmark parsers <corpus_dir>
+    python -m backend.benchmark skills <corpus_dir>
+    python -m backend.benchmark lsh [--jobs 200000] [--config 16x1 --config 32x2]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+from .resume_parser import ResumeParser, EXTRACTION_BACKENDS, DEFAULT_BACKEND, open_pdf
+from .skill_extractor import SkillExtractor
+
+def _corpus_files(corpus_dir: str):
+    files = sorted(glob.glob(os.path.join(corpus_dir, '**', '*.pdf'), recursive=True))
+    if not files:
+        sys.exit(f"No PDF files found in {corpus_dir}")
+    return files
+
+def _agreement(skills: set, baseline: set) -> float:
+    """Jaccard similarity of two skill sets (1.0 when both are empty)"""
+    union = skills | baseline
+    return len(skills & baseline) / len(union) if union else 1.0
+
+def benchmark_parsers(corpus_dir: str, backends=None):
+    """
+    Run every text extraction backend over a corpus of PDFs
+
+    Reports pages/sec per backend and how closely the extracted skills agree
+    with the default pdfplumber backend.
+    """
+    files = _corpus_files(corpus_dir)
+    backends = backends or list(EXTRACTION_BACKENDS)
+    extractor = SkillExtractor()
+
+    page_counts = {}
+    for path in files:
+        with open_pdf(path) as pdf:
+            page_counts[path] = len(pdf.pages)
+    total_pages = sum(page_counts.values())
+
+    results = {}
+    for backend in [DEFAULT_BACKEND] + [b for b in backends if b != DEFAULT_BACKEND]:
+        parser = ResumeParser(backend)
+        skills = {}
+        failures = 0
+        elapsed = 0.0
+        for path in files:
+            start = time.perf_counter()
+            try:
+                parsed = parser.parse_pdf(path)
+            except Exception:
+                failures += 1
+                continue
+            finally:
+                elapsed += time.perf_counter() - start
+            skills[path] = set(extractor.extract_skills(parsed.text, parsed.section_spans))
+        results[backend] = (skills, elapsed, failures)
+
+    baseline = results[DEFAULT_BACKEND][0]
+    print(f"Corpus: {len(files)} files, {total_pages} pages")
+    print(f"{'backend':<12} {'pages/sec':>10} {'seconds':>9} {'failed':>7} {'skill agreement':>16} {'identical':>10}")
+    for backend in backends:
+        skills, elapsed, failures = results[backend]
+        shared = [path for path in skills if path in baseline]
+        agreement = sum(_agreement(skills[p], baseline[p]) for p in shared) / len(shared) if shared else 0.0
+        identical = sum(1 for p in shared if skills[p] == baseline[p])
+        pages_per_sec = total_pages / elapsed if elapsed else 0.0
+        print(f"{backend:<12} {pages_per_sec:>10.1f} {elapsed:>9.2f} {failures:>7} "
+              f"{agreement * 100:>15.1f}% {identical:>5}/{len(shared):<4}")
+
+def _regex_loop_skills(extractor: SkillExtractor, text_lower: str) -> set:
+    """The previous extract_skills scan: one regex search per known skill"""
+    found = set()
+    for skill in extractor.technical_skills | extractor.soft_skills:
+        escaped_skill = re.escape(skill.lower())
+        if skill.lower().isalnum():
+            pattern = r'\b' + escaped_skill + r'\b'
+        else:
+            pattern = r'(?<!\w)' + escaped_skill + r'(?!\w)'
+        if re.search(pattern, text_lower, re.IGNORECASE):
+            found.add(skill)
+    return found
+
+def benchmark_skills(corpus_dir: str, repeat: int = 20):
+    """
+    Compare the per-skill regex loop with the single-pass SkillMatcher
+
+    Each PDF is parsed once; only the skill scan is timed.
+    """
+    files = _corpus_files(corpus_dir)
+    extractor = SkillExtractor()
+    parser = ResumeParser()
+    texts = []
+    for path in files:
+        try:
+            texts.append(parser.parse_pdf(path).text.lower())
+        except Exception:
+            continue
+    total_chars = sum(len(text) for text in texts)
+
+    mismatches = sum(1 for text in texts
+                     if extractor.matcher.find(text) != _regex_loop_skills(extractor, text))
+
+    timings = {}
+    for name, scan in (('regex loop', lambda text: _regex_loop_skills(extractor, text)),
+                       ('matcher', extractor.matcher.find)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                scan(text)
+        timings[name] = time.perf_counter() - start
+
+    runs = repeat * len(texts)
+    print(f"Corpus: {len(texts)} resumes, {total_chars} characters, {repeat} repeats")
+    print(f"{'scanner':<12} {'resumes/sec':>12} {'ms/resume':>10}")
+    for name, elapsed in timings.items():
+        print(f"{name:<12} {runs / elapsed:>12.1f} {elapsed / runs * 1000:>10.3f}")
+    print(f"Speedup: {timings['regex loop'] / timings['matcher']:.1f}x, "
+          f"results differ on {mismatches} of {len(texts)} resumes")
+
+def _synthetic_skill_lists(skills, count: int, min_size: int, max_size: int, rng):
+    """Skill lists drawn with a Zipf-like popularity, as in scraped postings"""
+    import numpy as np
+    weights = 1.0 / np.arange(1, len(skills) + 1) ** 0.8
+    weights = weights[rng.permutation(len(skills))]
+    weights /= weights.sum()
+    draws = rng.choice(len(skills), size=(count, max_size * 2), p=weights)
+    sizes = rng.integers(min_size, max_size + 1, count)
+    lists = []
+    for row, size in zip(draws, sizes):
+        _, first = np.unique(row, return_index=True)
+        lists.append([skills[i] for i in row[np.sort(first)][:size]])
+    return lists
+
+def benchmark_lsh(job_count: int = 200000, resume_count: int = 200, configs=None, k: int = 10, seed: int = 1):
+    """
+    Recall@K and latency of LSH candidate retrieval against exhaustive scoring
+
+    Jobs are synthetic (job_count of them, or the database catalog when
+    job_count is 0); resumes are the latest stored analyses, topped up
+    with synthetic ones.
+    """
+    import numpy as np
+    from .database import Database
+    from .job_catalog import JobCatalog
+    from .job_matcher import JobMatcher
+    from .skill_lsh import SkillLSH, retrieval_probability
+    from .skill_taxonomy import TaxonomyStore
+
+    rng = np.random.default_rng(seed)
+    taxonomy_store = TaxonomyStore()
+    taxonomy = taxonomy_store.current()
+    skills = sorted(taxonomy.technical_skills | taxonomy.soft_skills)
+    db = Database()
+
+    if job_count:
+        jobs = [{'id': i + 1, 'title': f'Job {i + 1}', 'company_id': i % 50 + 1,
+                 'required_skills': required, 'preferred_skills': preferred}
+                for i, (required, preferred) in enumerate(zip(
+                    _synthetic_skill_lists(skills, job_count, 3, 10, rng),
+                    _synthetic_skill_lists(skills, job_count, 0, 6, rng)))]
+    else:
+        jobs = db.get_all_jobs()
+    resumes = [a['extracted_skills'] for a in db.get_analyses_after(0, 1000000)[-resume_count:]
+               if a['extracted_skills']]
+    resumes += _synthetic_skill_lists(skills, resume_count - len(resumes), 8, 30, rng)
+
+    start = time.perf_counter()
+    catalog = JobCatalog(jobs, taxonomy.skill_index)
+    print(f"Catalog: {len(jobs)} jobs built in {time.perf_counter() - start:.2f}s; "
+          f"{len(resumes)} resumes, recall@{k}")
+    matcher = JobMatcher(taxonomy_store)
+
+    start = time.perf_counter()
+    exact = [matcher.rank_catalog(resume, catalog, top_k=k, exact=True)[0] for resume in resumes]
+    exact_ms = (time.perf_counter() - start) / len(resumes) * 1000
+
+    print(f"{'config':<8} {'build s':>8} {'cand %':>7} {'recall':>7} {'ms/resume':>10} {'exact ms':>9} {'speedup':>8}"
+          f" {'P(J=.2)':>8}")
+    skill_sets = [entry.required + entry.preferred for entry in catalog.jobs]
+    canonicalize = taxonomy.skill_index.canonicalize
+    for config in configs or ['16x1', '32x2', '64x3']:
+        bands, rows = (int(n) for n in config.split('x'))
+        start = time.perf_counter()
+        catalog.lsh = SkillLSH(skill_sets, bands, rows)
+        build_seconds = time.perf_counter() - start
+
+        candidates = sum(len(catalog.lsh.query({canonicalize(s) for s in resume})) for resume in resumes)
+        start = time.perf_counter()
+        approximate = [matcher.rank_catalog(resume, catalog, top_k=k)[0] for resume in resumes]
+        lsh_ms = (time.perf_counter() - start) / len(resumes) * 1000
+
+        recalls = []
+        for exact_ranked, lsh_ranked in zip(exact, approximate):
+            if exact_ranked:
+                found = {item[1] for item in lsh_ranked}
+                recalls.append(sum(1 for item in exact_ranked if item[1] in found) / len(exact_ranked))
+        recall = sum(recalls) / len(recalls) if recalls else 1.0
+        print(f"{config:<8} {build_seconds:>8.2f} {candidates / len(resumes) / len(jobs) * 100:>7.2f} "
+              f"{recall:>7.3f} {lsh_ms:>10.2f} {exact_ms:>9.2f} {exact_ms / lsh_ms:>7.1f}x"
+              f" {retrieval_probability(0.2, bands, rows):>8.3f}")
+    catalog.lsh = None
+
+def main():
+    parser = argparse.ArgumentParser(description='Resume pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parsers_cmd = subparsers.add_parser('parsers', help='Compare PDF text extraction backends')
+    parsers_cmd.add_argument('corpus_dir', help='Directory of PDF resumes (searched recursively)')
+    parsers_cmd.add_argument('--backend', action='append', choices=list(EXTRACTION_BACKENDS),
+                             help='Backend to include (repeatable, default: all)')
+
+    skills_cmd = subparsers.add_parser('skills', help='Compare the regex loop with the skill matcher')
+    skills_cmd.add_argument('corpus_dir', help='Directory of PDF resumes (searched recursively)')
+    skills_cmd.add_argument('--repeat', type=int, default=20, help='Passes over the corpus (default: 20)')
+
+    lsh_cmd = subparsers.add_parser('lsh', help='Recall and latency of LSH job retrieval vs exhaustive scoring')
+    lsh_cmd.add_argument('--jobs', type=int, default=200000,
+                         help='Synthetic catalog size (default: 200000, 0 uses the database catalog)')
+    lsh_cmd.add_argument('--resumes', type=int, default=200, help='Resumes to query (default: 200)')
+    lsh_cmd.add_argument('--config', action='append',
+                         help='LSH bands x rows, e.g. 16x1 (repeatable, default: 16x1, 32x2, 64x3)')
+    lsh_cmd.add_argument('-k', type=int, default=10, help='Top K jobs compared (default: 10)')
+
+    args = parser.parse_args()
+    if args.command == 'parsers':
+        benchmark_parsers(args.corpus_dir, args.backend)
+    elif args.command == 'skills':
+        benchmark_skills(args.corpus_dir, args.repeat)
+    elif args.command == 'lsh':
+        benchmark_lsh(args.jobs, args.resumes, args.config, args.k)
+
+if __name__ == '__main__':
+    main()
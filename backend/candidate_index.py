@@ -0,0 +1,277 @@
+"""
+Index of analyzed resumes for recruiter-side matching (job -> candidates)
+
+Every saved analysis already holds the resume's extracted skills, so
+ranking candidates for a job never touches the PDFs. A CandidatePool is
+an immutable snapshot of those skill sets with:
+
+- posting arrays from each canonical skill to the candidate rows having
+  it, so matched required/preferred counts for every candidate come from
+  a few vectorized additions, and
+- a sparse term-count matrix of the candidates' skill texts, from which
+  their TF-IDF cosine with a job under the job catalog's fitted model
+  (the one /api/analyze scores with) is computed for all candidates at
+  once.
+
+CandidateIndex keeps the pool current, appending analyses saved since
+the last refresh. Repeat analyses of the same PDF (same content hash)
+collapse into one candidate carrying the latest analysis.
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .skill_index import SkillIndex
+
+# Try to import NumPy and scikit-learn (with its SciPy dependency), but make them optional
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    SKLEARN_AVAILABLE = NUMPY_AVAILABLE
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+_analyzer = TfidfVectorizer().build_analyzer() if SKLEARN_AVAILABLE else None
+
+class Candidate:
+    """One analyzed resume with its canonical skills"""
+    __slots__ = ('row', 'analysis_id', 'filename', 'user_id', 'created_at', 'skills', 'skill_set')
+
+    def __init__(self, row: int, analysis: Dict, skills: List[str]):
+        # Position in the pool
+        self.row = row
+        self.analysis_id = analysis['id']
+        self.filename = analysis['filename']
+        self.user_id = analysis['user_id']
+        self.created_at = analysis['created_at']
+        self.skills = skills
+        self.skill_set = frozenset(skills)
+
+class CandidatePool:
+    """Immutable snapshot of indexed candidates for one taxonomy"""
+    def __init__(self, taxonomy_fingerprint: Optional[str] = None):
+        self.taxonomy_fingerprint = taxonomy_fingerprint
+        self.last_id = 0
+        self.candidates: List[Candidate] = []
+        self.postings: Dict[str, object] = {}
+        # Term counts of the candidates' skill texts (CSR), with a squared
+        # copy for the TF-IDF norms
+        self.vocabulary: Dict[str, int] = {}
+        self.term_counts = None
+        self.term_squares = None
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def extended(self, analyses: List[Dict], skill_index: SkillIndex, keys: Dict) -> 'CandidatePool':
+        """
+        A new pool with analyses (ordered by id) added
+
+        Args:
+            analyses: Rows from Database.get_analyses_after
+            skill_index: Alias index used to canonicalize skills
+            keys: Content hash (or analysis id for analyses saved without
+                one) -> row of the candidates so far; updated in place
+        """
+        pool = CandidatePool(self.taxonomy_fingerprint)
+        pool.last_id = self.last_id
+        pool.candidates = list(self.candidates)
+        pool.postings = self.postings
+        pool.vocabulary = self.vocabulary
+        canonicalize = skill_index.canonicalize
+
+        replaced_rows = set()
+        for analysis in analyses:
+            pool.last_id = max(pool.last_id, analysis['id'])
+            skills = sorted({canonicalize(s) for s in analysis['extracted_skills']})
+            key = analysis.get('content_hash') or ('analysis', analysis['id'])
+            row = keys.get(key)
+            if row is not None:
+                # Newer analysis of a resume already indexed; its row is re-indexed below
+                pool.candidates[row] = Candidate(row, analysis, skills)
+                if row < len(self.candidates):
+                    replaced_rows.add(row)
+                continue
+
+            candidate = Candidate(len(pool.candidates), analysis, skills)
+            keys[key] = candidate.row
+            pool.candidates.append(candidate)
+
+        new_rows = range(len(self.candidates), len(pool.candidates))
+        if NUMPY_AVAILABLE:
+            pool._update_postings(self, replaced_rows, new_rows)
+        if SKLEARN_AVAILABLE:
+            pool._extend_terms(
+                self,
+                [Counter(_analyzer(' '.join(pool.candidates[row].skills))) for row in new_rows],
+                {row: Counter(_analyzer(' '.join(pool.candidates[row].skills))) for row in replaced_rows}
+            )
+        return pool
+
+    def _update_postings(self, previous: 'CandidatePool', replaced_rows, new_rows):
+        """Postings with replaced rows moved to their new skills and new rows added"""
+        added: Dict[str, List[int]] = {}
+        removed: Dict[str, List[int]] = {}
+        for row in replaced_rows:
+            old_skills = previous.candidates[row].skill_set
+            new_skills = self.candidates[row].skill_set
+            for skill in old_skills - new_skills:
+                removed.setdefault(skill, []).append(row)
+            for skill in new_skills - old_skills:
+                added.setdefault(skill, []).append(row)
+        for row in new_rows:
+            for skill in self.candidates[row].skills:
+                added.setdefault(skill, []).append(row)
+        if not added and not removed:
+            return
+
+        self.postings = dict(previous.postings)
+        for skill, rows in removed.items():
+            self.postings[skill] = self.postings[skill][~np.isin(self.postings[skill], rows)]
+        for skill, rows in added.items():
+            rows = np.array(rows, dtype=np.int64)
+            existing = self.postings.get(skill)
+            self.postings[skill] = rows if existing is None else np.concatenate((existing, rows))
+
+    def _extend_terms(self, previous: 'CandidatePool', new_terms: List[Counter], replaced_terms: Dict[int, Counter]):
+        """Term matrices with replaced rows recounted and rows for new_terms appended"""
+        if not new_terms and not replaced_terms and previous.term_counts is not None:
+            for name in ('term_counts', 'term_squares'):
+                setattr(self, name, getattr(previous, name))
+            return
+
+        vocabulary = dict(previous.vocabulary)
+
+        def build(rows_terms):
+            # COO entries for (row, Counter) pairs, growing the vocabulary as needed
+            rows, columns, data = [], [], []
+            for row, counts in rows_terms:
+                for term, count in counts.items():
+                    rows.append(row)
+                    columns.append(vocabulary.setdefault(term, len(vocabulary)))
+                    data.append(count)
+            return rows, columns, data
+
+        new_entries = build(enumerate(new_terms))
+        replaced_entries = build(replaced_terms.items())
+        new_counts = sparse.csr_matrix(
+            (np.array(new_entries[2], dtype=np.float64),
+             (np.array(new_entries[0], dtype=np.int64), np.array(new_entries[1], dtype=np.int64))),
+            shape=(len(new_terms), len(vocabulary))
+        )
+        if previous.term_counts is not None:
+            old_counts = previous.term_counts.copy()
+            old_counts.resize((old_counts.shape[0], len(vocabulary)))
+            if replaced_terms:
+                # Zero the replaced rows, then add their new counts
+                keep = np.ones(old_counts.shape[0])
+                keep[list(replaced_terms)] = 0
+                replacements = sparse.csr_matrix(
+                    (np.array(replaced_entries[2], dtype=np.float64),
+                     (np.array(replaced_entries[0], dtype=np.int64), np.array(replaced_entries[1], dtype=np.int64))),
+                    shape=old_counts.shape
+                )
+                old_counts = (sparse.diags(keep) @ old_counts + replacements).tocsr()
+                old_counts.eliminate_zeros()
+            new_counts = sparse.vstack((old_counts, new_counts), format='csr')
+
+        self.vocabulary = vocabulary
+        self.term_counts = new_counts
+        self.term_squares = new_counts.multiply(new_counts).tocsr()
+
+    def match_counts(self, required: List[str], preferred: List[str]):
+        """
+        Matched required and preferred counts for every candidate
+
+        Skills are counted once per occurrence in the job's lists, as
+        calculate_match_score does.
+
+        Returns:
+            Two int64 arrays indexed by candidate row
+        """
+        matched_required = np.zeros(len(self.candidates), dtype=np.int64)
+        matched_preferred = np.zeros(len(self.candidates), dtype=np.int64)
+        for skills, counts in ((required, matched_required), (preferred, matched_preferred)):
+            for skill, occurrences in Counter(skills).items():
+                rows = self.postings.get(skill)
+                if rows is not None:
+                    counts[rows] += occurrences
+        return matched_required, matched_preferred
+
+    def semantic_similarities(self, catalog, job_index: int):
+        """
+        TF-IDF cosine similarity (0-100) of a catalog job to every candidate
+
+        Uses the catalog's fitted vectorizer, so each score equals the one
+        JobCatalog.semantic_similarities gives the same resume and job:
+        candidate term counts are weighted by the catalog idf (terms outside
+        its vocabulary dropped) and L2-normalized, as transform() would.
+
+        Args:
+            catalog: JobCatalog holding the job
+            job_index: The job's index in the catalog
+
+        Returns:
+            Array indexed by candidate row, or None without a fitted model
+        """
+        if not SKLEARN_AVAILABLE or catalog.vectorizer is None:
+            return None
+        similarities = np.zeros(len(self.candidates))
+        if self.term_counts is None:
+            return similarities
+
+        catalog_vocabulary = catalog.vectorizer.vocabulary_
+        idf = catalog.vectorizer.idf_
+        job_vector = catalog.job_vectors[job_index]
+        job_weights = dict(zip(job_vector.indices, job_vector.data))
+
+        # Per pool column: catalog idf, and idf times the job's TF-IDF weight
+        weights = np.zeros(len(self.vocabulary))
+        job_products = np.zeros(len(self.vocabulary))
+        for term, column in self.vocabulary.items():
+            catalog_column = catalog_vocabulary.get(term)
+            if catalog_column is not None:
+                weights[column] = idf[catalog_column]
+                job_products[column] = idf[catalog_column] * job_weights.get(catalog_column, 0.0)
+
+        dot = self.term_counts @ job_products
+        norms = np.sqrt(self.term_squares @ (weights * weights))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = np.where(norms > 0, dot / norms, 0.0)
+        return similarities * 100
+
+class CandidateIndex:
+    """
+    Serves the current CandidatePool, appending newly saved analyses
+
+    A taxonomy change rebuilds the pool, since canonical skills change.
+    """
+    def __init__(self, db, taxonomy_store, batch_size: int = 5000):
+        self.db = db
+        self.taxonomy_store = taxonomy_store
+        self.batch_size = batch_size
+        self._pool: Optional[CandidatePool] = None
+        self._keys: Dict = {}
+        self._lock = threading.Lock()
+
+    def current(self) -> CandidatePool:
+        taxonomy = self.taxonomy_store.current()
+        with self._lock:
+            pool = self._pool
+            if pool is None or pool.taxonomy_fingerprint != taxonomy.fingerprint:
+                pool = CandidatePool(taxonomy.fingerprint)
+                self._keys = {}
+
+            analyses = self.db.get_analyses_after(pool.last_id, self.batch_size)
+            while analyses:
+                pool = pool.extended(analyses, taxonomy.skill_index, self._keys)
+                analyses = self.db.get_analyses_after(pool.last_id, self.batch_size)
+
+            self._pool = pool
+            return pool
@@ -11,10 +11,50 @@ class Config:
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = {'pdf'}
+    PERSIST_UPLOADS = os.environ.get('PERSIST_UPLOADS', 'true').lower() == 'true'  # written in the background
+    
+    # Parse executor settings (PARSE_POOL_SIZE=0 parses inline)
+    PARSE_POOL_SIZE = int(os.environ.get('PARSE_POOL_SIZE', min(4, os.cpu_count() or 1)))
+    PARSE_TIMEOUT = float(os.environ.get('PARSE_TIMEOUT', 20))  # seconds per document
+    PARSE_MAX_PAGES = int(os.environ.get('PARSE_MAX_PAGES', 50))
+    PARSE_WORKER_MAX_TASKS = int(os.environ.get('PARSE_WORKER_MAX_TASKS', 100))
+    PDF_TEXT_BACKEND = os.environ.get('PDF_TEXT_BACKEND', 'pdfplumber')  # pdfplumber, simple or chars
+    PAGE_PARALLEL_THRESHOLD = int(os.environ.get('PAGE_PARALLEL_THRESHOLD', 8))  # 0 disables
+    
+    # SpaCy settings (the model is loaded lazily on first use)
+    SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+    SPACY_MAX_CHARS = int(os.environ.get('SPACY_MAX_CHARS', 100000))  # text cap per resume
+    SPACY_BATCH_SIZE = int(os.environ.get('SPACY_BATCH_SIZE', 32))
+    SPACY_N_PROCESS = int(os.environ.get('SPACY_N_PROCESS', 1))
+    
+    # Skill taxonomy (data/skill_taxonomy.json, compiled to data/skill_taxonomy.pkl)
+    TAXONOMY_CHECK_INTERVAL = float(os.environ.get('TAXONOMY_CHECK_INTERVAL', 30))  # seconds, 0 disables
+    
+    # Background tasks (POST /api/upload or /api/analyze with async=true)
+    ASYNC_TASKS = os.environ.get('ASYNC_TASKS', 'false').lower() == 'true'  # default mode when not requested
+    TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 2))  # worker processes per app process, 0 = run separately
+    TASK_POLL_INTERVAL = float(os.environ.get('TASK_POLL_INTERVAL', 0.5))  # seconds between queue checks
+    TASK_STALE_AFTER = float(os.environ.get('TASK_STALE_AFTER', 300))  # re-run tasks running this long
+    TASK_MAX_ATTEMPTS = int(os.environ.get('TASK_MAX_ATTEMPTS', 3))
+    
+    # Match results (POST /api/analyze returns one page, the rest via /api/analyses/<id>/matches)
+    MATCH_PAGE_SIZE = int(os.environ.get('MATCH_PAGE_SIZE', 20))  # default limit
+    MATCH_MAX_PAGE_SIZE = int(os.environ.get('MATCH_MAX_PAGE_SIZE', 100))
+    MATCH_CACHE_SIZE = int(os.environ.get('MATCH_CACHE_SIZE', 1024))  # cached rankings per process
+    BATCH_MAX_RESUMES = int(os.environ.get('BATCH_MAX_RESUMES', 1000))  # per POST /api/match/batch
+    BATCH_MAX_CELLS = int(os.environ.get('BATCH_MAX_CELLS', 2000000))  # resume x job scores per chunk (~40 bytes each)
+    
+    # Approximate job retrieval for very large catalogs (MinHash/LSH; needs NumPy)
+    MATCH_LSH_BANDS = int(os.environ.get('MATCH_LSH_BANDS', 0))  # 0 disables; more bands, higher recall
+    MATCH_LSH_ROWS = int(os.environ.get('MATCH_LSH_ROWS', 1))  # more rows per band, fewer candidates
+    MATCH_LSH_MIN_JOBS = int(os.environ.get('MATCH_LSH_MIN_JOBS', 50000))  # smaller catalogs are scored exhaustively
     
     # Database settings
     DATABASE_PATH = 'resume_analyzer.db'
     
+    # Parse cache settings
+    PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE', 256))  # in-memory LRU entries
+    
     # API settings
     API_BASE_URL = os.environ.get('API_BASE_URL') or 'https://resume-analyse-backend.onrender.com/'
     
@@ -1,7 +1,7 @@
 import sqlite3
 import json
 import os
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 class Database:
     def __init__(self, db_path='resume_analyzer.db'):
@@ -68,14 +68,101 @@ class Database:
                 extracted_skills TEXT,
                 analysis_result TEXT,
                 user_id INTEGER,
+                content_hash TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(id)
             )
         ''')
+        # Analyses saved before content_hash was recorded keep it NULL
+        cursor.execute('PRAGMA table_info(resume_analyses)')
+        if 'content_hash' not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE resume_analyses ADD COLUMN content_hash TEXT')
+        
+        # Parsed resume cache (keyed by SHA-256 of the PDF bytes)
+        # parse_cache only holds derived data, so an outdated layout is dropped
+        cursor.execute('PRAGMA table_info(parse_cache)')
+        parse_cache_columns = {row[1] for row in cursor.fetchall()}
+        if parse_cache_columns and 'taxonomy_fingerprint' not in parse_cache_columns:
+            cursor.execute('DROP TABLE parse_cache')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS parse_cache (
+                content_hash TEXT PRIMARY KEY,
+                cache_version INTEGER NOT NULL,
+                resume_text TEXT,
+                sections TEXT,
+                section_spans TEXT,
+                skills TEXT,
+                taxonomy_fingerprint TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Bumped on every company/job write so in-memory job catalogs know when to rebuild
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS catalog_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)')
+        
+        # Content-addressed uploads (see upload_store.py): one row per upload,
+        # one reference-counted blob per distinct PDF
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS upload_blobs (
+                content_hash TEXT PRIMARY KEY,
+                refcount INTEGER NOT NULL,
+                size INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS uploads (
+                id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                filename TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (content_hash) REFERENCES upload_blobs(content_hash)
+            )
+        ''')
+        
+        # Background task queue (see task_queue.py); times are Unix timestamps
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT,
+                result TEXT,
+                status_code INTEGER,
+                attempts INTEGER DEFAULT 0,
+                worker_pid INTEGER,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, created_at)')
         
         conn.commit()
         conn.close()
     
+    def _bump_catalog_version(self, cursor):
+        """Mark the job catalog as changed (call inside the writing transaction)"""
+        cursor.execute('UPDATE catalog_version SET version = version + 1 WHERE id = 1')
+    
+    def get_catalog_version(self) -> int:
+        """Current job catalog version"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT version FROM catalog_version WHERE id = 1')
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else 0
+    
     def add_company(self, name: str, description: str = None, logo_url: str = None, website: str = None):
         """Add a new company"""
         conn = self.get_connection()
@@ -85,6 +172,7 @@ class Database:
             INSERT INTO companies (name, description, logo_url, website)
             VALUES (?, ?, ?, ?)
         ''', (name, description, logo_url, website))
+        self._bump_catalog_version(cursor)
         
         conn.commit()
         company_id = cursor.lastrowid
@@ -161,6 +249,7 @@ class Database:
         if updates:
             values.append(company_id)
             cursor.execute(f'UPDATE companies SET {", ".join(updates)} WHERE id = ?', values)
+            self._bump_catalog_version(cursor)
             conn.commit()
         
         conn.close()
@@ -172,6 +261,7 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM companies WHERE id = ?', (company_id,))
+        self._bump_catalog_version(cursor)
         conn.commit()
         conn.close()
         return True
@@ -188,6 +278,7 @@ class Database:
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (company_id, title, description, json.dumps(required_skills), 
               json.dumps(preferred_skills or []), experience_level, location, salary_range))
+        self._bump_catalog_version(cursor)
         
         conn.commit()
         job_id = cursor.lastrowid
@@ -308,6 +399,7 @@ class Database:
         if updates:
             values.append(job_id)
             cursor.execute(f'UPDATE job_roles SET {", ".join(updates)} WHERE id = ?', values)
+            self._bump_catalog_version(cursor)
             conn.commit()
         
         conn.close()
@@ -319,25 +411,335 @@ class Database:
         cursor = conn.cursor()
         
         cursor.execute('DELETE FROM job_roles WHERE id = ?', (job_id,))
+        self._bump_catalog_version(cursor)
         conn.commit()
         conn.close()
         return True
     
-    def save_analysis(self, filename: str, extracted_skills: List[str], analysis_result: Dict, user_id: int = None):
-        """Save resume analysis result"""
+    def save_analysis(self, filename: str, extracted_skills: List[str], analysis_result: Dict, user_id: int = None,
+                      content_hash: str = None):
+        """Save resume analysis result (content_hash identifies the analyzed PDF)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute('''
-            INSERT INTO resume_analyses (filename, extracted_skills, analysis_result, user_id)
-            VALUES (?, ?, ?, ?)
-        ''', (filename, json.dumps(extracted_skills), json.dumps(analysis_result), user_id))
+            INSERT INTO resume_analyses (filename, extracted_skills, analysis_result, user_id, content_hash)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (filename, json.dumps(extracted_skills), json.dumps(analysis_result), user_id, content_hash))
         
         conn.commit()
         analysis_id = cursor.lastrowid
         conn.close()
         return analysis_id
     
+    def get_analysis(self, analysis_id: int) -> Optional[Dict]:
+        """Get a saved resume analysis by id"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, filename, extracted_skills, analysis_result, user_id, created_at
+            FROM resume_analyses WHERE id = ?
+        ''', (analysis_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            return {
+                'id': row[0],
+                'filename': row[1],
+                'extracted_skills': json.loads(row[2]) if row[2] else [],
+                'analysis_result': json.loads(row[3]) if row[3] else {},
+                'user_id': row[4],
+                'created_at': row[5]
+            }
+        return None
+    
+    def get_analyses_after(self, after_id: int = 0, limit: int = 5000) -> List[Dict]:
+        """Saved analyses with id greater than after_id (skills only, oldest first)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, filename, extracted_skills, user_id, created_at, content_hash
+            FROM resume_analyses WHERE id > ? ORDER BY id LIMIT ?
+        ''', (after_id, limit))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [{
+            'id': row[0],
+            'filename': row[1],
+            'extracted_skills': json.loads(row[2]) if row[2] else [],
+            'user_id': row[3],
+            'created_at': row[4],
+            'content_hash': row[5]
+        } for row in rows]
+    
+    def get_parse_cache(self, content_hash: str) -> Optional[Dict]:
+        """Get a cached parse result by content hash"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT content_hash, cache_version, resume_text, sections, section_spans, skills, taxonomy_fingerprint
+            FROM parse_cache WHERE content_hash = ?
+        ''', (content_hash,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            section_spans = json.loads(row[4]) if row[4] else {}
+            return {
+                'content_hash': row[0],
+                'cache_version': row[1],
+                'text': row[2],
+                'sections': json.loads(row[3]) if row[3] else {},
+                'section_spans': {name: tuple(tuple(span) for span in spans)
+                                  for name, spans in section_spans.items()},
+                'skills': json.loads(row[5]) if row[5] else [],
+                'taxonomy_fingerprint': row[6]
+            }
+        return None
+    
+    def save_parse_cache(self, content_hash: str, cache_version: int, resume_text: str,
+                         sections: Dict, section_spans: Dict, skills: List[str],
+                         taxonomy_fingerprint: str):
+        """Store (or replace) a parse result for a content hash"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO parse_cache (content_hash, cache_version, resume_text, sections,
+                                                section_spans, skills, taxonomy_fingerprint)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (content_hash, cache_version, resume_text, json.dumps(sections),
+              json.dumps(section_spans), json.dumps(skills), taxonomy_fingerprint))
+        
+        conn.commit()
+        conn.close()
+        return True
+    
+    def save_parse_cache_many(self, entries: List[Dict], cache_version: int):
+        """
+        Store many parse results in a single transaction
+        
+        Args:
+            entries: Dicts with content_hash, text, sections, section_spans,
+                skills and taxonomy_fingerprint keys
+            cache_version: Parse cache version the entries were produced with
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT OR REPLACE INTO parse_cache (content_hash, cache_version, resume_text, sections,
+                                                section_spans, skills, taxonomy_fingerprint)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(entry['content_hash'], cache_version, entry['text'], json.dumps(entry['sections']),
+               json.dumps(entry['section_spans']), json.dumps(entry['skills']), entry['taxonomy_fingerprint'])
+              for entry in entries])
+        
+        conn.commit()
+        conn.close()
+        return len(entries)
+    
+    def get_parse_cache_hashes(self, cache_version: int, taxonomy_fingerprint: str) -> set:
+        """Content hashes with an up-to-date cached parse result"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT content_hash FROM parse_cache
+            WHERE cache_version = ? AND taxonomy_fingerprint = ?
+        ''', (cache_version, taxonomy_fingerprint))
+        hashes = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return hashes
+    
+    def add_upload(self, upload_id: str, content_hash: str, filename: str, size: int) -> bool:
+        """
+        Map an upload id to a content hash and take a reference on its blob
+        
+        Returns:
+            True if this is the first reference to the content hash
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO upload_blobs (content_hash, refcount, size) VALUES (?, 1, ?)
+            ON CONFLICT(content_hash) DO UPDATE SET refcount = refcount + 1
+        ''', (content_hash, size))
+        cursor.execute('''
+            INSERT INTO uploads (id, content_hash, filename) VALUES (?, ?, ?)
+        ''', (upload_id, content_hash, filename))
+        cursor.execute('SELECT refcount FROM upload_blobs WHERE content_hash = ?', (content_hash,))
+        refcount = cursor.fetchone()[0]
+        
+        conn.commit()
+        conn.close()
+        return refcount == 1
+    
+    def get_upload(self, upload_id: str) -> Optional[Dict]:
+        """Get an upload by id"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, content_hash, filename, created_at FROM uploads WHERE id = ?
+        ''', (upload_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            return {
+                'id': row[0],
+                'content_hash': row[1],
+                'filename': row[2],
+                'created_at': row[3]
+            }
+        return None
+    
+    def delete_upload(self, upload_id: str) -> Optional[tuple]:
+        """
+        Remove an upload and drop its blob reference
+        
+        Returns:
+            (content_hash, remaining references), or None if the upload is unknown
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT content_hash FROM uploads WHERE id = ?', (upload_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+        
+        content_hash = row[0]
+        cursor.execute('DELETE FROM uploads WHERE id = ?', (upload_id,))
+        cursor.execute('UPDATE upload_blobs SET refcount = refcount - 1 WHERE content_hash = ?', (content_hash,))
+        cursor.execute('SELECT refcount FROM upload_blobs WHERE content_hash = ?', (content_hash,))
+        remaining = cursor.fetchone()[0]
+        if remaining <= 0:
+            cursor.execute('DELETE FROM upload_blobs WHERE content_hash = ?', (content_hash,))
+        
+        conn.commit()
+        conn.close()
+        return content_hash, max(remaining, 0)
+    
+    def create_task(self, task_id: str, kind: str, payload: Dict, created_at: float):
+        """Add a queued task"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT INTO tasks (id, kind, status, payload, created_at)
+            VALUES (?, ?, 'queued', ?, ?)
+        ''', (task_id, kind, json.dumps(payload), created_at))
+        
+        conn.commit()
+        conn.close()
+        return task_id
+    
+    def claim_task(self, worker_pid: int, now: float, stale_before: float, max_attempts: int,
+                   on_exhausted: Optional[Callable[[str, Dict], None]] = None) -> Optional[Dict]:
+        """
+        Atomically take the oldest runnable task and mark it running
+        
+        Args:
+            worker_pid: Process id of the claiming worker
+            now: Current Unix time
+            stale_before: Running tasks started before this time are assumed
+                lost (their worker died) and may be claimed again
+            max_attempts: Tasks already tried this many times are failed instead
+            on_exhausted: Called with (kind, payload) of each task failed that
+                way, before the transaction commits, to release its resources
+            
+        Returns:
+            The claimed task (id, kind, payload, attempts), or None if the queue is empty
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        try:
+            # BEGIN IMMEDIATE takes the write lock first, so two workers
+            # can never claim the same row
+            cursor.execute('BEGIN IMMEDIATE')
+            while True:
+                cursor.execute('''
+                    SELECT id, kind, payload, attempts FROM tasks
+                    WHERE status = 'queued' OR (status = 'running' AND started_at < ?)
+                    ORDER BY created_at LIMIT 1
+                ''', (stale_before,))
+                row = cursor.fetchone()
+                if not row:
+                    conn.commit()
+                    return None
+                
+                if row[3] >= max_attempts:
+                    cursor.execute('''
+                        UPDATE tasks SET status = 'failed', result = ?, status_code = 500, finished_at = ?
+                        WHERE id = ?
+                    ''', (json.dumps({'error': f'Task failed after {row[3]} attempts'}), now, row[0]))
+                    if on_exhausted:
+                        on_exhausted(row[1], json.loads(row[2]) if row[2] else {})
+                    continue
+                
+                cursor.execute('''
+                    UPDATE tasks SET status = 'running', attempts = attempts + 1, worker_pid = ?, started_at = ?
+                    WHERE id = ?
+                ''', (worker_pid, now, row[0]))
+                conn.commit()
+                return {
+                    'id': row[0],
+                    'kind': row[1],
+                    'payload': json.loads(row[2]) if row[2] else {},
+                    'attempts': row[3] + 1
+                }
+        finally:
+            conn.close()
+    
+    def finish_task(self, task_id: str, status: str, result: Dict, status_code: int, finished_at: float):
+        """Record a task's final status ('done' or 'failed') and result"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            UPDATE tasks SET status = ?, result = ?, status_code = ?, finished_at = ?
+            WHERE id = ?
+        ''', (status, json.dumps(result), status_code, finished_at, task_id))
+        
+        conn.commit()
+        conn.close()
+        return True
+    
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a task by id"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT id, kind, status, result, status_code, attempts, created_at, started_at, finished_at
+            FROM tasks WHERE id = ?
+        ''', (task_id,))
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            return {
+                'id': row[0],
+                'kind': row[1],
+                'status': row[2],
+                'result': json.loads(row[3]) if row[3] else None,
+                'status_code': row[4],
+                'attempts': row[5],
+                'created_at': row[6],
+                'started_at': row[7],
+                'finished_at': row[8]
+            }
+        return None
+    
     def create_user(self, email: str, password_hash: str, name: str, role: str = 'user'):
         """Create a new user"""
         conn = self.get_connection()
@@ -0,0 +1,187 @@
+"""
+Bulk resume ingestion: parse a folder of PDFs into the parse cache
+
+Usage:
+    python -m backend.ingest path/to/resumes [--workers 8]
+    python -m backend.ingest "campaign/**/*.pdf"
+
+Files are parsed and their skills extracted in a process pool; results are
+written to the parse_cache table in batched transactions, so later uploads
+or analyses of the same PDFs are served from the cache.
+"""
+import argparse
+import glob
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .config import Config
+from .database import Database
+from .parse_cache import CACHE_VERSION, hash_bytes
+from .resume_parser import ResumeParser
+from .skill_extractor import SkillExtractor
+
+STAGES = ('read', 'parse', 'extract', 'store')
+
+# Per-worker state, set up once by _init_worker
+_parser = None
+_extractor = None
+_known_hashes = frozenset()
+_max_pages = None
+
+def _init_worker(backend: str, max_pages: int, known_hashes: frozenset):
+    global _parser, _extractor, _known_hashes, _max_pages
+    _parser = ResumeParser(backend)
+    _extractor = SkillExtractor(
+        spacy_model=Config.SPACY_MODEL,
+        max_nlp_chars=Config.SPACY_MAX_CHARS
+    )
+    _known_hashes = known_hashes
+    _max_pages = max_pages
+
+def _ingest_file(path: str) -> Dict:
+    """Read, hash, parse and extract one PDF (runs in a pool worker)"""
+    result = {'path': path, 'entry': None, 'error': None, 'timings': {}}
+    try:
+        started = time.perf_counter()
+        with open(path, 'rb') as f:
+            data = f.read()
+        content_hash = hash_bytes(data)
+        result['content_hash'] = content_hash
+        read_done = time.perf_counter()
+        result['timings']['read'] = read_done - started
+        if content_hash in _known_hashes:
+            return result
+
+        parsed = _parser.parse_pdf(data, max_pages=_max_pages)
+        parse_done = time.perf_counter()
+        result['timings']['parse'] = parse_done - read_done
+
+        taxonomy = _extractor.taxonomy
+        skills = _extractor.extract_skills(parsed.text, parsed.section_spans)
+        result['timings']['extract'] = time.perf_counter() - parse_done
+
+        result['entry'] = {
+            'content_hash': content_hash,
+            'text': parsed.text,
+            'sections': parsed.sections,
+            'section_spans': parsed.section_spans,
+            'skills': skills,
+            'taxonomy_fingerprint': taxonomy.fingerprint
+        }
+    except Exception as e:
+        result['error'] = str(e) or e.__class__.__name__
+    return result
+
+def find_pdfs(target: str) -> List[str]:
+    """PDF files under a directory (recursively) or matching a glob pattern"""
+    if os.path.isdir(target):
+        pattern = os.path.join(target, '**', '*.pdf')
+    else:
+        pattern = target
+    return sorted(path for path in glob.glob(pattern, recursive=True)
+                  if path.lower().endswith('.pdf') and os.path.isfile(path))
+
+def ingest(files: List[str], db: Database, workers: Optional[int] = None, batch_size: int = 200,
+           force: bool = False, progress_every: int = 500) -> Dict:
+    """
+    Parse many resumes in parallel and store them in the parse cache
+
+    Args:
+        files: PDF paths to ingest
+        db: Database to write parse_cache rows into
+        workers: Worker processes (defaults to the CPU count)
+        batch_size: Rows written per transaction
+        force: Re-parse files that are already cached
+        progress_every: Print a progress line every this many files (0 disables)
+
+    Returns:
+        Dictionary with counts, per-stage timings and failures
+    """
+    workers = workers or os.cpu_count() or 1
+    known_hashes = frozenset()
+    if not force:
+        fingerprint = SkillExtractor().taxonomy.fingerprint
+        known_hashes = frozenset(db.get_parse_cache_hashes(CACHE_VERSION, fingerprint))
+
+    report = {
+        'files': len(files), 'ingested': 0, 'cached': 0, 'duplicates': 0,
+        'failures': [], 'timings': dict.fromkeys(STAGES, 0.0), 'elapsed': 0.0
+    }
+    seen_hashes = set()
+    batch = []
+
+    def flush():
+        started = time.perf_counter()
+        report['ingested'] += db.save_parse_cache_many(batch, CACHE_VERSION)
+        report['timings']['store'] += time.perf_counter() - started
+        batch.clear()
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(workers, initializer=_init_worker,
+                      initargs=(Config.PDF_TEXT_BACKEND, Config.PARSE_MAX_PAGES, known_hashes),
+                      maxtasksperchild=Config.PARSE_WORKER_MAX_TASKS) as pool:
+        chunksize = max(1, min(16, len(files) // (workers * 4)))
+        for done, result in enumerate(pool.imap_unordered(_ingest_file, files, chunksize), 1):
+            for stage, seconds in result['timings'].items():
+                report['timings'][stage] += seconds
+
+            if result['error']:
+                report['failures'].append((result['path'], result['error']))
+            elif result['entry'] is None:
+                report['cached'] += 1
+            elif result['content_hash'] in seen_hashes:
+                report['duplicates'] += 1
+            else:
+                seen_hashes.add(result['content_hash'])
+                batch.append(result['entry'])
+                if len(batch) >= batch_size:
+                    flush()
+
+            if progress_every and done % progress_every == 0:
+                elapsed = time.perf_counter() - started
+                print(f"  {done}/{len(files)} files, {done / elapsed:.1f} files/sec", file=sys.stderr)
+    if batch:
+        flush()
+
+    report['elapsed'] = time.perf_counter() - started
+    return report
+
+def print_report(report: Dict, max_failures: int = 20):
+    elapsed = report['elapsed']
+    print(f"Files: {report['files']}  ingested: {report['ingested']}  already cached: {report['cached']}  "
+          f"duplicates: {report['duplicates']}  failed: {len(report['failures'])}")
+    print(f"Elapsed: {elapsed:.2f}s  ({report['files'] / elapsed if elapsed else 0.0:.1f} files/sec)")
+    print(f"{'stage':<8} {'seconds':>9} {'ms/file':>9}")
+    for stage in STAGES:
+        seconds = report['timings'][stage]
+        print(f"{stage:<8} {seconds:>9.2f} {seconds / report['files'] * 1000 if report['files'] else 0.0:>9.2f}")
+    print("(read/parse/extract are summed across workers; store runs in the main process)")
+
+    for path, error in report['failures'][:max_failures]:
+        print(f"FAILED {path}: {error}")
+    if len(report['failures']) > max_failures:
+        print(f"... and {len(report['failures']) - max_failures} more failures")
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-ingest resume PDFs into the parse cache')
+    parser.add_argument('target', help='Directory of PDFs (searched recursively) or a glob pattern')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--batch-size', type=int, default=200, help='Rows per database transaction (default: 200)')
+    parser.add_argument('--force', action='store_true', help='Re-parse files that are already cached')
+
+    args = parser.parse_args()
+    files = find_pdfs(args.target)
+    if not files:
+        sys.exit(f"No PDF files found for {args.target}")
+
+    report = ingest(files, Database(), workers=args.workers, batch_size=args.batch_size, force=args.force)
+    print_report(report)
+    if report['failures'] and len(report['failures']) == report['files']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
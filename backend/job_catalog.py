@@ -0,0 +1,357 @@
+"""
+In-memory job catalog with an inverted skill index
+
+A JobCatalog is an immutable snapshot of every job with its skills
+canonicalized once, plus posting lists from each canonical skill to the
+jobs that ask for it. Matching a resume walks only the posting lists of
+its own skills, so jobs sharing no skill with it are never touched.
+
+When scikit-learn is available the snapshot also holds a TF-IDF model
+fit once over all job skill texts and the job vectors as a CSR matrix,
+so a resume is vectorized once and compared with every job in one
+sparse product. With NumPy, the required/preferred skills of every job
+are also packed into bit matrices (SkillBitsets) so match counts for the
+whole catalog come from a few vectorized AND/popcount operations. For
+batches of resumes, SkillMatrices holds the same lists as sparse
+skills-by-jobs count matrices, so a whole batch is counted with one
+resumes-by-skills product.
+
+Very large catalogs can also get a MinHash/LSH index (SkillLSH) so that
+exact scoring only runs on the jobs it retrieves for a resume.
+"""
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .skill_index import SkillIndex
+
+# Try to import scikit-learn and NumPy, but make them optional
+try:
+    from scipy import sparse
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+if NUMPY_AVAILABLE:
+    from .skill_lsh import SkillLSH
+
+REQUIRED = 0
+PREFERRED = 1
+
+class CatalogJob:
+    """One job with its canonical skill lists"""
+    __slots__ = ('index', 'job', 'required', 'preferred')
+
+    def __init__(self, index: int, job: Dict, required: List[str], preferred: List[str]):
+        # Position in the catalog (the job order from the database)
+        self.index = index
+        self.job = job
+        self.required = required
+        self.preferred = preferred
+
+def _popcount_rows(words):
+    """Set bits per row of a 2-D uint64 array"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+class SkillBitsets:
+    """
+    Jobs' required and preferred skills as packed uint64 bit matrices
+
+    Every canonical skill in the catalog gets an integer id (one bit).
+    A job listing the same canonical skill twice (e.g. "js" and
+    "javascript") has one bit but counts twice in the list-based score,
+    so those rows are recounted exactly from their lists.
+    """
+    def __init__(self, jobs: List[CatalogJob]):
+        self.skill_ids: Dict[str, int] = {}
+        for entry in jobs:
+            for skill in entry.required + entry.preferred:
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+        self.words = max(1, (len(self.skill_ids) + 63) // 64)
+
+        self.required = self._pack(jobs, 'required')
+        self.preferred = self._pack(jobs, 'preferred')
+        self.required_totals = np.array([len(entry.required) for entry in jobs], dtype=np.int64)
+        self.preferred_totals = np.array([len(entry.preferred) for entry in jobs], dtype=np.int64)
+        self.company_ids = np.array([entry.job.get('company_id') or 0 for entry in jobs], dtype=np.int64)
+        self.duplicate_rows = [entry for entry in jobs
+                               if len(set(entry.required)) != len(entry.required)
+                               or len(set(entry.preferred)) != len(entry.preferred)]
+
+    def _pack(self, jobs: List[CatalogJob], field: str):
+        rows, ids = [], []
+        for entry in jobs:
+            for skill in set(getattr(entry, field)):
+                rows.append(entry.index)
+                ids.append(self.skill_ids[skill])
+        matrix = np.zeros((len(jobs), self.words), dtype=np.uint64)
+        if ids:
+            ids = np.array(ids, dtype=np.uint64)
+            np.bitwise_or.at(matrix, (np.array(rows), (ids >> np.uint64(6)).astype(np.intp)),
+                             np.left_shift(np.uint64(1), ids & np.uint64(63)))
+        return matrix
+
+    def resume_vector(self, resume_skills: set):
+        """Resume skills as one packed bit vector (skills no job lists are dropped)"""
+        vector = np.zeros(self.words, dtype=np.uint64)
+        ids = np.array([self.skill_ids[s] for s in resume_skills if s in self.skill_ids], dtype=np.uint64)
+        if len(ids):
+            np.bitwise_or.at(vector, (ids >> np.uint64(6)).astype(np.intp),
+                             np.left_shift(np.uint64(1), ids & np.uint64(63)))
+        return vector
+
+    def match_counts(self, resume_skills: set, rows=None):
+        """
+        Matched required and preferred skill counts for every job
+
+        Args:
+            resume_skills: Canonical resume skills
+            rows: Only count these jobs (sorted job indices)
+
+        Returns:
+            Two int64 arrays indexed by job index, or aligned with rows
+        """
+        vector = self.resume_vector(resume_skills)
+        required = self.required if rows is None else self.required[rows]
+        preferred = self.preferred if rows is None else self.preferred[rows]
+        matched_required = _popcount_rows(required & vector)
+        matched_preferred = _popcount_rows(preferred & vector)
+        for entry in self.duplicate_rows:
+            position = entry.index
+            if rows is not None:
+                position = np.searchsorted(rows, entry.index)
+                if position == len(rows) or rows[position] != entry.index:
+                    continue
+            matched_required[position] = sum(1 for s in entry.required if s in resume_skills)
+            matched_preferred[position] = sum(1 for s in entry.preferred if s in resume_skills)
+        return matched_required, matched_preferred
+
+class SkillMatrices:
+    """
+    Jobs' required and preferred skills as sparse skills x jobs count matrices
+
+    Entries count occurrences in the job's lists, so the product with a
+    0/1 resumes x skills matrix gives exactly the list-based match counts.
+    """
+    def __init__(self, jobs: List[CatalogJob]):
+        self.skill_ids: Dict[str, int] = {}
+        for entry in jobs:
+            for skill in entry.required + entry.preferred:
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+        self.required = self._counts(jobs, 'required')
+        self.preferred = self._counts(jobs, 'preferred')
+
+    def _counts(self, jobs: List[CatalogJob], field: str):
+        rows, columns = [], []
+        for entry in jobs:
+            for skill in getattr(entry, field):
+                rows.append(self.skill_ids[skill])
+                columns.append(entry.index)
+        # Duplicate (skill, job) entries are summed
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, columns)),
+                                 shape=(len(self.skill_ids), len(jobs)))
+
+    def resume_matrix(self, resume_skill_sets: List[set]):
+        """Resumes as a 0/1 resumes x skills CSR matrix (skills no job lists are dropped)"""
+        rows, columns = [], []
+        for row, resume_skills in enumerate(resume_skill_sets):
+            for skill in resume_skills:
+                column = self.skill_ids.get(skill)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, columns)),
+                                 shape=(len(resume_skill_sets), len(self.skill_ids)))
+
+    def match_counts(self, resume_skill_sets: List[set]):
+        """
+        Matched required and preferred counts for every resume and job
+
+        Returns:
+            Two dense int64 arrays of shape (resumes, jobs)
+        """
+        resumes = self.resume_matrix(resume_skill_sets)
+        return (resumes @ self.required).toarray(), (resumes @ self.preferred).toarray()
+
+class JobCatalog:
+    """
+    Immutable snapshot of the job catalog for one catalog version
+
+    postings maps a canonical skill to (job index, REQUIRED/PREFERRED)
+    entries, one per occurrence in the job's skill lists, so summing
+    postings gives the same counts as comparing the lists directly.
+    """
+    def __init__(self, jobs: List[Dict], skill_index: SkillIndex, version: int = 0,
+                 taxonomy_fingerprint: Optional[str] = None, lsh_bands: int = 0, lsh_rows: int = 1):
+        """
+        Args:
+            jobs: Jobs as returned by Database.get_all_jobs
+            skill_index: Alias index used to canonicalize skills
+            version: Catalog version the jobs were read at
+            taxonomy_fingerprint: Fingerprint of the taxonomy behind skill_index
+            lsh_bands: Build a MinHash/LSH candidate index with this many
+                bands (0 disables; needs NumPy)
+            lsh_rows: Hash functions per LSH band
+        """
+        self.version = version
+        self.taxonomy_fingerprint = taxonomy_fingerprint
+        canonicalize = skill_index.canonicalize
+
+        self.jobs: List[CatalogJob] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+        for index, job in enumerate(jobs):
+            required = [canonicalize(s) for s in job.get('required_skills', [])]
+            preferred = [canonicalize(s) for s in job.get('preferred_skills', [])]
+            self.jobs.append(CatalogJob(index, job, required, preferred))
+            for skill in required:
+                self.postings.setdefault(skill, []).append((index, REQUIRED))
+            for skill in preferred:
+                self.postings.setdefault(skill, []).append((index, PREFERRED))
+
+        self.jobs_by_id = {entry.job['id']: entry for entry in self.jobs}
+        self.company_counts = Counter(entry.job.get('company_id') for entry in self.jobs)
+        self.vectorizer, self.job_vectors = self._fit_tfidf()
+        self.bitsets = SkillBitsets(self.jobs) if NUMPY_AVAILABLE and self.jobs else None
+        self.skill_matrices = SkillMatrices(self.jobs) if SKLEARN_AVAILABLE and NUMPY_AVAILABLE and self.jobs else None
+        self.lsh = None
+        if lsh_bands and NUMPY_AVAILABLE and self.jobs:
+            self.lsh = SkillLSH([entry.required + entry.preferred for entry in self.jobs], lsh_bands, lsh_rows)
+
+    def _fit_tfidf(self):
+        """Fit TF-IDF over the job skill texts (None, None without scikit-learn)"""
+        if not SKLEARN_AVAILABLE or not self.jobs:
+            return None, None
+        try:
+            vectorizer = TfidfVectorizer()
+            job_vectors = vectorizer.fit_transform(
+                ' '.join(entry.required + entry.preferred) for entry in self.jobs
+            ).tocsr()
+            return vectorizer, job_vectors
+        except ValueError:
+            # Empty vocabulary (no job lists any skill)
+            return None, None
+
+    def semantic_similarities(self, resume_text: str, rows=None):
+        """
+        TF-IDF cosine similarity (0-100) of a resume skill text to every job
+
+        Args:
+            resume_text: Canonical resume skills joined by spaces
+            rows: Only compare with these jobs (job indices)
+
+        Returns:
+            Array indexed by job index (or aligned with rows), or None
+            without a fitted model
+        """
+        if self.vectorizer is None:
+            return None
+        # Rows are L2-normalized, so the dot product is the cosine similarity;
+        # fitted vectorizers are read-only, so this is safe across threads
+        resume_vector = self.vectorizer.transform([resume_text])
+        job_vectors = self.job_vectors if rows is None else self.job_vectors[rows]
+        return (job_vectors @ resume_vector.T).toarray().ravel() * 100
+
+    def text_similarity(self, resume_text: str, job_text: str):
+        """
+        TF-IDF cosine similarity (0-100) of a resume skill text to any job skill text
+
+        For a job in the catalog this equals its semantic_similarities entry.
+
+        Returns:
+            The similarity, or None without a fitted model
+        """
+        if self.vectorizer is None:
+            return None
+        resume_vector, job_vector = self.vectorizer.transform([resume_text, job_text])
+        return float((resume_vector @ job_vector.T).toarray()[0, 0]) * 100
+
+    def semantic_similarity_matrix(self, resume_texts: List[str]):
+        """
+        semantic_similarities for many resumes with one transform and one product
+
+        Returns:
+            Array of shape (resumes, jobs), or None without a fitted model
+        """
+        if self.vectorizer is None:
+            return None
+        resume_vectors = self.vectorizer.transform(resume_texts)
+        return (self.job_vectors @ resume_vectors.T).toarray().T * 100
+
+    def job_count(self, company_id: Optional[int] = None) -> int:
+        """Number of jobs, optionally for one company"""
+        if company_id:
+            return self.company_counts.get(company_id, 0)
+        return len(self.jobs)
+
+    def candidates(self, resume_skills: set, company_id: Optional[int] = None) -> Dict[int, List[int]]:
+        """
+        Jobs sharing at least one skill with the resume
+
+        Args:
+            resume_skills: Canonical resume skills
+            company_id: Only return jobs of this company
+
+        Returns:
+            job index -> [matched required count, matched preferred count]
+        """
+        counts = {}
+        for skill in resume_skills:
+            for index, kind in self.postings.get(skill, ()):
+                job_counts = counts.get(index)
+                if job_counts is None:
+                    job_counts = counts[index] = [0, 0]
+                job_counts[kind] += 1
+
+        if company_id:
+            jobs = self.jobs
+            counts = {index: job_counts for index, job_counts in counts.items()
+                      if jobs[index].job.get('company_id') == company_id}
+        return counts
+
+class JobCatalogStore:
+    """
+    Serves the current JobCatalog, rebuilding it when the catalog version
+    in the database or the skill taxonomy changes
+
+    Each check is one indexed single-row query, so every process (app or
+    task worker) sees admin edits on its next request. Catalogs of at
+    least lsh_min_jobs jobs get an LSH index when lsh_bands is set.
+    """
+    def __init__(self, db, taxonomy_store, lsh_bands: int = 0, lsh_rows: int = 1, lsh_min_jobs: int = 0):
+        self.db = db
+        self.taxonomy_store = taxonomy_store
+        self.lsh_bands = lsh_bands
+        self.lsh_rows = lsh_rows
+        self.lsh_min_jobs = lsh_min_jobs
+        self._catalog: Optional[JobCatalog] = None
+        self._lock = threading.Lock()
+
+    def current(self) -> JobCatalog:
+        version = self.db.get_catalog_version()
+        taxonomy = self.taxonomy_store.current()
+        catalog = self._catalog
+        if catalog is not None and catalog.version == version \
+                and catalog.taxonomy_fingerprint == taxonomy.fingerprint:
+            return catalog
+
+        with self._lock:
+            catalog = self._catalog
+            if catalog is None or catalog.version != version \
+                    or catalog.taxonomy_fingerprint != taxonomy.fingerprint:
+                # Read the version before the jobs: a write in between only
+                # causes one extra rebuild, never a stale snapshot
+                jobs = self.db.get_all_jobs()
+                lsh_bands = self.lsh_bands if len(jobs) >= self.lsh_min_jobs else 0
+                catalog = JobCatalog(jobs, taxonomy.skill_index, version, taxonomy.fingerprint,
+                                     lsh_bands, self.lsh_rows)
+                self._catalog = catalog
+            return catalog
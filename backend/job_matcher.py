@@ -1,59 +1,227 @@
-from typing import List, Dict
-
-# Try to import scikit-learn, but make it optional
-try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+import heapq
+from functools import lru_cache
+from typing import List, Dict, Optional, Set, Tuple
+from .candidate_index import CandidatePool
+from .job_catalog import JobCatalog, NUMPY_AVAILABLE
+from .skill_index import SkillIndex
+from .skill_taxonomy import TaxonomyStore
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+# Improvement tip categories: (label, max skills listed or None for all, keywords).
+# A skill belongs to every category with a keyword occurring in its lowercased name.
+TIP_CATEGORIES = (
+    ('Programming Languages', None, (
+        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', ' c ',
+        'go', 'rust', 'kotlin', 'swift', 'php', 'ruby', 'scala', 'perl',
+        'shell', 'bash', 'powershell', 'matlab', ' r '
+    )),
+    ('Core CS Concepts', 3, (
+        'data structures', 'algorithms', 'oop', 'oops',
+        'object oriented programming',
+        'design patterns', 'system design',
+        'operating systems', 'computer networks', 'dbms',
+        'multithreading', 'concurrency', 'memory management'
+    )),
+    ('Web Fundamentals', 3, (
+        'html', 'css', 'sass', 'bootstrap', 'tailwind',
+        'responsive design', 'cross browser'
+    )),
+    ('Frontend Skills', 3, (
+        'react', 'redux', 'next.js',
+        'angular', 'vue', 'nuxt',
+        'vite', 'webpack'
+    )),
+    ('Backend & APIs', 3, (
+        'node.js', 'express', 'nestjs',
+        'django', 'django rest', 'flask', 'fastapi',
+        'spring', 'spring boot',
+        'asp.net', 'laravel', 'rails',
+        'rest api', 'graphql', 'grpc',
+        'web sockets', 'api development',
+        'authentication', 'authorization',
+        'jwt', 'oauth', 'session management'
+    )),
+    ('Databases', 3, (
+        'sql', 'mysql', 'postgresql', 'sqlite', 'oracle',
+        'mongodb', 'redis', 'dynamodb', 'cassandra',
+        'elasticsearch', 'neo4j', 'pl/sql'
+    )),
+    ('Cloud & DevOps', 3, (
+        'aws', 'azure', 'gcp', 'cloud',
+        'ec2', 's3', 'rds', 'lambda', 'cloud functions',
+        'docker', 'kubernetes',
+        'ci/cd', 'jenkins', 'github actions',
+        'terraform', 'ansible',
+        'linux', 'unix',
+        'nginx', 'apache',
+        'load balancing', 'auto scaling'
+    )),
+    ('Monitoring & Logging', 3, (
+        'monitoring', 'prometheus', 'grafana',
+        'elk', 'log monitoring'
+    )),
+    ('Testing & QA', 3, (
+        'unit testing', 'integration testing',
+        'pytest', 'junit', 'jest', 'mocha',
+        'selenium', 'cypress',
+        'tdd', 'bdd', 'test driven'
+    )),
+    ('Data Science & Analytics', 3, (
+        'data analysis', 'data preprocessing',
+        'feature engineering', 'data modeling',
+        'pandas', 'numpy', 'matplotlib', 'seaborn',
+        'jupyter', 'etl', 'statistics'
+    )),
+    ('Machine Learning & AI', 3, (
+        'machine learning', 'deep learning',
+        'supervised learning', 'unsupervised learning',
+        'neural networks',
+        'tensorflow', 'pytorch', 'keras', 'scikit-learn',
+        'nlp', 'natural language processing',
+        'computer vision', 'opencv',
+        'transformers', 'hugging face',
+        'llms', 'chatbots',
+        'recommendation systems',
+        'model evaluation', 'model deployment',
+        'mlops', 'cuda'
+    )),
+    ('Mobile Development', 3, (
+        'android', 'ios', 'react native', 'flutter', 'xamarin', 'xcode'
+    )),
+    ('Security', 3, (
+        'security', 'web security', 'cloud security',
+        'owasp', 'xss', 'csrf', 'sql injection',
+        'encryption', 'hashing'
+    )),
+    ('Tools & Collaboration', 3, (
+        'git', 'github', 'gitlab',
+        'jira', 'confluence',
+        'code review', 'pull requests'
+    )),
+    ('Software Architecture & Practices', 3, (
+        'agile', 'scrum', 'kanban',
+        'microservices',
+        'monolithic',
+        'serverless',
+        'distributed systems',
+        'performance tuning'
+    )),
+    ('Softskill', 3, (
+        'communication', 'leadership', 'teamwork',
+        'problem solving', 'critical thinking',
+        'analytical thinking',
+        'project management', 'time management',
+        'collaboration', 'adaptability',
+        'creativity', 'attention to detail',
+        'decision making', 'initiative',
+        'ownership', 'conflict resolution',
+        'mentorship', 'presentation skills',
+        'documentation', 'multitasking'
+    )),
+)
+
+@lru_cache(maxsize=16384)
+def skill_tip_categories(skill: str) -> Tuple[int, ...]:
+    """Indices into TIP_CATEGORIES of the categories a skill belongs to (resolved once per skill)"""
+    skill_lower = skill.lower()
+    return tuple(i for i, (_, _, keywords) in enumerate(TIP_CATEGORIES)
+                 if any(k in skill_lower for k in keywords))
+
+@lru_cache(maxsize=4096)
+def _improvement_tips(job_title: str, missing_skills: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Improvement tips for a job title and its missing skills (in job order)"""
+    if not missing_skills:
+        return ("Great! You have all the required skills for this position.",)
+    
+    tips = [f"To improve your match for {job_title}, consider learning or highlighting:"]
+    
+    # Bucket the missing skills by category, keeping their order
+    buckets = [[] for _ in TIP_CATEGORIES]
+    for skill in missing_skills:
+        for category in skill_tip_categories(skill):
+            buckets[category].append(skill)
+    
+    for (label, max_listed, _), skills in zip(TIP_CATEGORIES, buckets):
+        if skills:
+            tips.append(f"• {label}: {', '.join(skills[:max_listed])}")
+    
+    # General tips
+    if len(missing_skills) > 5:
+        tips.append("• Consider taking online courses or certifications for the missing skills")
+        tips.append("• Build projects demonstrating these skills")
+        tips.append("• Update your resume to highlight any related experience")
+    
+    return tuple(tips)
 
 class JobMatcher:
-    def __init__(self):
-        self.vectorizer = None
-        if SKLEARN_AVAILABLE:
-            try:
-                self.vectorizer = TfidfVectorizer()
-            except:
-                self.vectorizer = None
+    def __init__(self, taxonomy_store: TaxonomyStore = None):
+        # Shared taxonomy so resume and job skills compare by canonical name
+        self.taxonomy_store = taxonomy_store or TaxonomyStore()
+    
+    @property
+    def skill_index(self) -> SkillIndex:
+        """Alias index of the live taxonomy"""
+        return self.taxonomy_store.current().skill_index
     
     def calculate_match_score(self, resume_skills: List[str], job_required_skills: List[str], 
-                             job_preferred_skills: List[str] = None) -> Dict:
+                             job_preferred_skills: List[str] = None, catalog: Optional[JobCatalog] = None) -> Dict:
         """
         Calculate match score between resume skills and job requirements
         
+        Semantic similarity uses the catalog's fitted TF-IDF model, so a job
+        from the catalog gets the score the API endpoints give it. Without a
+        catalog (or a fitted model) it falls back to word overlap, as the
+        endpoints do.
+        
         Args:
             resume_skills: List of skills extracted from resume
             job_required_skills: Required skills for the job
             job_preferred_skills: Preferred skills for the job
+            catalog: JobCatalog whose TF-IDF model to score with
             
         Returns:
             Dictionary with match score and analysis
         """
-        resume_skills_lower = [s.lower() for s in resume_skills]
-        required_skills_lower = [s.lower() for s in job_required_skills]
-        preferred_skills_lower = [s.lower() for s in (job_preferred_skills or [])]
+        canonicalize = self.skill_index.canonicalize
+        resume_skills_lower = {canonicalize(s) for s in resume_skills}
+        required_skills_lower = [canonicalize(s) for s in job_required_skills]
+        preferred_skills_lower = [canonicalize(s) for s in (job_preferred_skills or [])]
+        resume_skills_sorted = sorted(resume_skills_lower)
+        job_skills = required_skills_lower + preferred_skills_lower
+        
+        semantic_score = None
+        if catalog is not None and resume_skills_sorted:
+            semantic_score = catalog.text_similarity(' '.join(resume_skills_sorted), ' '.join(job_skills))
+        if semantic_score is None:
+            semantic_score = self._calculate_semantic_similarity(resume_skills_sorted, job_skills)
         
+        return self._score_job(
+            resume_skills_lower, required_skills_lower, preferred_skills_lower,
+            sum(1 for s in required_skills_lower if s in resume_skills_lower),
+            sum(1 for s in preferred_skills_lower if s in resume_skills_lower),
+            semantic_score
+        )
+    
+    def _score_job(self, resume_skills: Set[str], required_skills: List[str], preferred_skills: List[str],
+                   matched_required: int, matched_preferred: int, semantic_score: float) -> Dict:
+        """Score one job from canonical skills, match counts and semantic similarity"""
         # Find matching skills
-        matching_required = [s for s in required_skills_lower if s in resume_skills_lower]
-        matching_preferred = [s for s in preferred_skills_lower if s in resume_skills_lower]
+        matching_required = [s for s in required_skills if s in resume_skills]
+        matching_preferred = [s for s in preferred_skills if s in resume_skills]
         
         # Missing skills
-        missing_required = [s for s in required_skills_lower if s not in resume_skills_lower]
-        missing_preferred = [s for s in preferred_skills_lower if s not in resume_skills_lower]
+        missing_required = [s for s in required_skills if s not in resume_skills]
+        missing_preferred = [s for s in preferred_skills if s not in resume_skills]
         
         # Calculate scores
-        required_score = len(matching_required) / len(required_skills_lower) * 100 if required_skills_lower else 0
-        preferred_score = len(matching_preferred) / len(preferred_skills_lower) * 100 if preferred_skills_lower else 0
+        required_score = matched_required / len(required_skills) * 100 if required_skills else 0
+        preferred_score = matched_preferred / len(preferred_skills) * 100 if preferred_skills else 0
         
         # Overall score (70% required, 30% preferred)
         overall_score = (required_score * 0.7) + (preferred_score * 0.3)
         
-        # Use TF-IDF for semantic similarity
-        semantic_score = self._calculate_semantic_similarity(
-            resume_skills, job_required_skills + (job_preferred_skills or [])
-        )
-        
         # Combine exact match and semantic similarity
         final_score = (overall_score * 0.7) + (semantic_score * 0.3)
         
@@ -65,35 +233,20 @@ class JobMatcher:
             'matching_preferred_skills': matching_preferred,
             'missing_required_skills': missing_required,
             'missing_preferred_skills': missing_preferred,
-            'total_required_skills': len(required_skills_lower),
-            'total_preferred_skills': len(preferred_skills_lower),
-            'matched_required_count': len(matching_required),
-            'matched_preferred_count': len(matching_preferred)
+            'total_required_skills': len(required_skills),
+            'total_preferred_skills': len(preferred_skills),
+            'matched_required_count': matched_required,
+            'matched_preferred_count': matched_preferred
         }
     
     def _calculate_semantic_similarity(self, resume_skills: List[str], job_skills: List[str]) -> float:
-        """Calculate semantic similarity using TF-IDF (if available) or simple word overlap"""
+        """
+        Word overlap (Jaccard) similarity, used where no fitted catalog TF-IDF model is available
+        """
         if not resume_skills or not job_skills:
             return 0.0
         
-        # If scikit-learn is available, use TF-IDF
-        if SKLEARN_AVAILABLE and self.vectorizer:
-            try:
-                # Combine skills into text
-                resume_text = ' '.join(resume_skills)
-                job_text = ' '.join(job_skills)
-                
-                # Vectorize
-                vectors = self.vectorizer.fit_transform([resume_text, job_text])
-                
-                # Calculate cosine similarity
-                similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-                
-                return similarity * 100  # Convert to percentage
-            except:
-                pass
-        
-        # Fallback: Simple word overlap similarity
+        # Simple word overlap similarity
         resume_words = set(word.lower() for skill in resume_skills for word in skill.split())
         job_words = set(word.lower() for skill in job_skills for word in skill.split())
         
@@ -121,328 +274,453 @@ class JobMatcher:
         Returns:
             List of matched jobs with scores, sorted by score
         """
+        return self.match_catalog(resume_skills, JobCatalog(jobs, self.skill_index))
+    
+    def match_catalog(self, resume_skills: List[str], catalog: JobCatalog,
+                      company_id: Optional[int] = None, limit: Optional[int] = None,
+                      offset: int = 0, min_score: Optional[float] = None) -> List[Dict]:
+        """
+        Match resume with the jobs in a catalog snapshot
+        
+        Only jobs sharing at least one skill with the resume are scored,
+        and full result dicts are built only for the returned page.
+        
+        Args:
+            resume_skills: Skills extracted from resume
+            catalog: JobCatalog to match against
+            company_id: Only match jobs of this company
+            limit: Return at most this many jobs (None for all)
+            offset: Skip this many of the best jobs first
+            min_score: Only return jobs scoring at least this much
+            
+        Returns:
+            List of matched jobs with scores, sorted by score
+        """
+        top_k = offset + limit if limit is not None else None
+        ranked, _ = self.rank_catalog(resume_skills, catalog, company_id, min_score, top_k)
+        return self.build_matches(resume_skills, catalog, ranked[offset:])
+    
+    def rank_catalog(self, resume_skills: List[str], catalog: JobCatalog, company_id: Optional[int] = None,
+                     min_score: Optional[float] = None, top_k: Optional[int] = None,
+                     exact: bool = False) -> Tuple[List[Tuple], int]:
+        """
+        Rank catalog jobs for a resume without building result dicts
+        
+        Match counts come from the catalog's skill bitsets when NumPy is
+        available, otherwise from its posting lists. Only the best top_k
+        jobs are selected and sorted. If the catalog has an LSH index,
+        only the jobs it retrieves are scored (exactly) unless exact is set.
+        
+        Returns:
+            (ranked, total): ranked is a best-first list of (match score,
+            job index, matched required, matched preferred, semantic score)
+            tuples, total the number of jobs scoring at least min_score
+        """
+        canonicalize = self.skill_index.canonicalize
+        resume_skills_lower = {canonicalize(s) for s in resume_skills}
+        resume_skills_sorted = sorted(resume_skills_lower)
+        
+        if catalog.bitsets is None:
+            semantic_scores = catalog.semantic_similarities(' '.join(resume_skills_sorted)) \
+                if resume_skills_sorted else None
+            return self._rank_postings(resume_skills_lower, resume_skills_sorted, catalog,
+                                       company_id, semantic_scores, min_score, top_k)
+        
+        # Approximate candidate stage: jobs sharing an LSH band with the resume
+        rows = catalog.lsh.query(resume_skills_lower) if catalog.lsh is not None and not exact else None
+        
+        # One TF-IDF transform and one sparse product against the catalog (or the candidates)
+        semantic_scores = catalog.semantic_similarities(' '.join(resume_skills_sorted), rows) \
+            if resume_skills_sorted else None
+        return self._rank_bitsets(resume_skills_lower, resume_skills_sorted, catalog,
+                                  company_id, semantic_scores, min_score, top_k, rows)
+    
+    def rank_batch(self, resume_skill_lists: List[List[str]], catalog: JobCatalog,
+                   company_id: Optional[int] = None, min_score: Optional[float] = None,
+                   top_k: Optional[int] = None, max_cells: int = 2_000_000):
+        """
+        rank_catalog for many resumes, scored as one resumes x jobs matrix
+        
+        Each chunk of resumes is counted with one sparse resumes x skills
+        by skills x jobs product and compared with one TF-IDF transform,
+        so the per-resume work is only picking its top K.
+        
+        Args:
+            resume_skill_lists: Skills extracted from each resume
+            max_cells: Resume x job cells per chunk; each chunk holds a few
+                dense arrays of this size (about 40 bytes per cell), so the
+                resumes per chunk shrink as the catalog grows
+            
+        Yields:
+            (ranked, total) per resume, in input order, as rank_catalog returns
+        """
+        matrices = catalog.skill_matrices
+        if matrices is None:
+            for resume_skills in resume_skill_lists:
+                yield self.rank_catalog(resume_skills, catalog, company_id, min_score, top_k)
+            return
+        
+        canonicalize = self.skill_index.canonicalize
+        bitsets = catalog.bitsets
+        in_company = bitsets.company_ids == company_id if company_id else None
+        chunk_size = max(1, max_cells // len(catalog.jobs))
+        
+        for start in range(0, len(resume_skill_lists), chunk_size):
+            skill_sets = [{canonicalize(s) for s in resume_skills}
+                          for resume_skills in resume_skill_lists[start:start + chunk_size]]
+            sorted_skills = [sorted(skill_set) for skill_set in skill_sets]
+            matched_required, matched_preferred = matrices.match_counts(skill_sets)
+            
+            semantic = catalog.semantic_similarity_matrix([' '.join(skills) for skills in sorted_skills])
+            if semantic is None:
+                semantic = np.zeros(matched_required.shape)
+                for row, column in zip(*np.nonzero(matched_required + matched_preferred)):
+                    semantic[row, column] = self._job_semantic_score(column, catalog, sorted_skills[row], None)
+            scores = np.round(self._final_score(
+                matched_required, bitsets.required_totals[np.newaxis, :],
+                matched_preferred, bitsets.preferred_totals[np.newaxis, :], semantic
+            ), 2)
+            
+            candidates = (matched_required + matched_preferred) > 0
+            if in_company is not None:
+                candidates &= in_company
+            if min_score is not None:
+                candidates &= scores >= min_score
+            
+            for row in range(len(skill_sets)):
+                indices = np.flatnonzero(candidates[row])
+                # Best score first, catalog order among ties
+                order = indices[self._top_k_order(scores[row, indices], indices, top_k)]
+                yield [(float(scores[row, i]), int(i), int(matched_required[row, i]),
+                        int(matched_preferred[row, i]), float(semantic[row, i])) for i in order], len(indices)
+    
+    def rescore_whatif(self, resume_skills: List[str], catalog: JobCatalog, add: List[str], remove: List[str],
+                       company_id: Optional[int] = None) -> Tuple[List[str], List[Dict]]:
+        """
+        Score changes from adding or removing resume skills
+        
+        A skill change moves the resume's TF-IDF vector, so every job
+        sharing a skill with the old or the new skill set is re-scored,
+        not just the jobs listing a changed skill. Match counts come from
+        the posting lists and the semantic scores from one sparse product
+        per skill set over that union of jobs.
+        
+        Args:
+            resume_skills: Current resume skills
+            catalog: JobCatalog to match against
+            add: Skills to add
+            remove: Skills to remove
+            company_id: Only consider jobs of this company
+            
+        Returns:
+            (new canonical skills, changes): one dict per job whose score
+            changes. status is 'changed' (new match details, previous_score
+            and score_delta), 'added' (a job that shares no skill with the
+            current resume, so /api/analyze does not list it; previous_score
+            and score_delta are None) or 'removed' (a job that would share no
+            skill any more; only its identity and previous_score are given)
+        """
+        canonicalize = self.skill_index.canonicalize
+        old_skills = {canonicalize(s) for s in resume_skills}
+        added = {canonicalize(s) for s in add} - old_skills
+        removed = {canonicalize(s) for s in remove} & old_skills
+        new_skills = (old_skills | added) - removed
+        if not added and not removed:
+            return sorted(new_skills), []
+        
+        # Jobs sharing a skill with each skill set, as rank_catalog selects them
+        old_counts = catalog.candidates(old_skills, company_id)
+        new_counts = catalog.candidates(new_skills, company_id)
+        indices = sorted(old_counts.keys() | new_counts.keys())
+        if not indices:
+            return sorted(new_skills), []
+        
+        old_semantic = self._semantic_rows(catalog, indices, sorted(old_skills))
+        new_semantic = self._semantic_rows(catalog, indices, sorted(new_skills))
+        
+        changes = []
+        for position, index in enumerate(indices):
+            entry = catalog.jobs[index]
+            previous_score = None
+            if index in old_counts:
+                old_required, old_preferred = old_counts[index]
+                previous_score = round(self._final_score(old_required, len(entry.required), old_preferred,
+                                                         len(entry.preferred), old_semantic[position]), 2)
+            if index not in new_counts:
+                changes.append({
+                    'job_id': entry.job['id'],
+                    'company_id': entry.job.get('company_id'),
+                    'company_name': entry.job.get('company_name', 'Unknown Company'),
+                    'job_title': entry.job['title'],
+                    'status': 'removed',
+                    'match_score': None,
+                    'previous_score': previous_score,
+                    'score_delta': None
+                })
+                continue
+            
+            new_required, new_preferred = new_counts[index]
+            match_result = self._score_job(
+                new_skills, entry.required, entry.preferred, new_required, new_preferred, new_semantic[position]
+            )
+            if previous_score is not None and match_result['overall_score'] == previous_score:
+                continue
+            match = self._match_entry(entry.job, match_result)
+            match['status'] = 'added' if previous_score is None else 'changed'
+            match['previous_score'] = previous_score
+            match['score_delta'] = None if previous_score is None \
+                else round(match['match_score'] - previous_score, 2)
+            changes.append(match)
+        return sorted(new_skills), changes
+    
+    def _semantic_rows(self, catalog: JobCatalog, indices: List[int], resume_skills_sorted: List[str]) -> List[float]:
+        """Semantic scores of a resume against some catalog jobs"""
+        if not resume_skills_sorted:
+            return [0.0] * len(indices)
+        semantic_scores = catalog.semantic_similarities(' '.join(resume_skills_sorted), indices)
+        if semantic_scores is not None:
+            return [float(score) for score in semantic_scores]
+        return [self._job_semantic_score(index, catalog, resume_skills_sorted, None) for index in indices]
+    
+    def build_matches(self, resume_skills: List[str], catalog: JobCatalog, ranked: List[Tuple]) -> List[Dict]:
+        """Result dicts for ranked (score, job index, ...) tuples from rank_catalog"""
+        canonicalize = self.skill_index.canonicalize
+        resume_skills_lower = {canonicalize(s) for s in resume_skills}
+        
         matches = []
+        for _, index, matched_required, matched_preferred, semantic_score in ranked:
+            entry = catalog.jobs[index]
+            match_result = self._score_job(
+                resume_skills_lower, entry.required, entry.preferred,
+                matched_required, matched_preferred, semantic_score
+            )
+            matches.append(self._match_entry(entry.job, match_result))
+        return matches
+    
+    def _job_semantic_score(self, index: int, catalog: JobCatalog, resume_skills_sorted: List[str],
+                            semantic_scores) -> float:
+        if semantic_scores is not None:
+            return float(semantic_scores[index])
+        entry = catalog.jobs[index]
+        return self._calculate_semantic_similarity(resume_skills_sorted, entry.required + entry.preferred)
+    
+    def _rank_postings(self, resume_skills: Set[str], resume_skills_sorted: List[str], catalog: JobCatalog,
+                       company_id: Optional[int], semantic_scores, min_score: Optional[float],
+                       top_k: Optional[int]) -> Tuple[List[Tuple], int]:
+        """rank_catalog over the posting lists, with a heap for the top K"""
+        scored = []
+        for index, (matched_required, matched_preferred) in catalog.candidates(resume_skills, company_id).items():
+            entry = catalog.jobs[index]
+            semantic_score = self._job_semantic_score(index, catalog, resume_skills_sorted, semantic_scores)
+            score = round(self._final_score(matched_required, len(entry.required),
+                                            matched_preferred, len(entry.preferred), semantic_score), 2)
+            if min_score is None or score >= min_score:
+                scored.append((score, index, matched_required, matched_preferred, semantic_score))
         
-        for job in jobs:
-            match_result = self.calculate_match_score(
-                resume_skills,
-                job.get('required_skills', []),
-                job.get('preferred_skills', [])
+        # Best score first, catalog order among ties
+        key = lambda item: (-item[0], item[1])
+        if top_k is not None and top_k < len(scored):
+            return heapq.nsmallest(top_k, scored, key=key), len(scored)
+        return sorted(scored, key=key), len(scored)
+    
+    def _rank_bitsets(self, resume_skills: Set[str], resume_skills_sorted: List[str], catalog: JobCatalog,
+                      company_id: Optional[int], semantic_scores, min_score: Optional[float],
+                      top_k: Optional[int], rows=None) -> Tuple[List[Tuple], int]:
+        """
+        rank_catalog computed for all jobs (or the job indices in rows) at once with NumPy
+        
+        semantic_scores is aligned with rows when rows is given.
+        """
+        bitsets = catalog.bitsets
+        matched_required, matched_preferred = bitsets.match_counts(resume_skills, rows)
+        job_indices = rows if rows is not None else np.arange(len(catalog.jobs))
+        
+        candidates = (matched_required + matched_preferred) > 0
+        if company_id:
+            candidates &= bitsets.company_ids[job_indices] == company_id
+        # Positions into job_indices and the arrays aligned with it
+        positions = np.flatnonzero(candidates)
+        indices = job_indices[positions]
+        
+        if semantic_scores is not None:
+            semantic = semantic_scores[positions]
+        else:
+            semantic = np.array([self._job_semantic_score(int(i), catalog, resume_skills_sorted, None)
+                                 for i in indices], dtype=np.float64)
+        matched_required, matched_preferred = matched_required[positions], matched_preferred[positions]
+        scores = np.round(self._final_score(
+            matched_required, bitsets.required_totals[indices],
+            matched_preferred, bitsets.preferred_totals[indices], semantic
+        ), 2)
+        
+        if min_score is not None:
+            keep = scores >= min_score
+            indices, scores, semantic = indices[keep], scores[keep], semantic[keep]
+            matched_required, matched_preferred = matched_required[keep], matched_preferred[keep]
+        total = len(indices)
+        
+        # Best score first, catalog order among ties
+        order = self._top_k_order(scores, indices, top_k)
+        
+        return [(float(scores[i]), int(indices[i]), int(matched_required[i]),
+                 int(matched_preferred[i]), float(semantic[i])) for i in order], total
+    
+    @staticmethod
+    def _top_k_order(scores, tie_keys, top_k: Optional[int]):
+        """Positions of the top_k highest scores, best first, ascending tie_keys among ties"""
+        total = len(scores)
+        selected = np.arange(total)
+        if top_k is not None and top_k < total:
+            # Everything at least as good as the k-th best score (ties included),
+            # so only that slice needs sorting
+            threshold = np.partition(scores, total - top_k)[total - top_k]
+            selected = np.flatnonzero(scores >= threshold)
+        return selected[np.lexsort((tie_keys[selected], -scores[selected]))][:top_k]
+    
+    def rank_candidates(self, job: Dict, pool: CandidatePool, catalog: JobCatalog,
+                        min_score: Optional[float] = None, top_k: Optional[int] = None) -> Tuple[List[Tuple], int]:
+        """
+        Rank indexed candidates (analyzed resumes) for one job
+        
+        Scores are the ones /api/analyze gives the same resume and job:
+        semantic similarity comes from the catalog's TF-IDF model (word
+        overlap without one), computed for all candidates at once when
+        NumPy is available.
+        
+        Args:
+            job: The job, as returned by Database.get_job_by_id
+            pool: Indexed candidates
+            catalog: Current JobCatalog (should hold the job)
+        
+        Returns:
+            (ranked, total): ranked is a best-first list of (match score,
+            candidate row, matched required, matched preferred, semantic
+            score) tuples, most recent candidate first among ties; total the
+            number of candidates scoring at least min_score
+        """
+        entry = catalog.jobs_by_id.get(job['id'])
+        if entry is not None:
+            required, preferred = entry.required, entry.preferred
+        else:
+            canonicalize = self.skill_index.canonicalize
+            required = [canonicalize(s) for s in job.get('required_skills', [])]
+            preferred = [canonicalize(s) for s in job.get('preferred_skills', [])]
+        job_skills = required + preferred
+        
+        if not NUMPY_AVAILABLE:
+            scored = []
+            for candidate in pool.candidates:
+                matched_required = sum(1 for s in required if s in candidate.skill_set)
+                matched_preferred = sum(1 for s in preferred if s in candidate.skill_set)
+                semantic_score = self._calculate_semantic_similarity(candidate.skills, job_skills)
+                score = round(self._final_score(matched_required, len(required),
+                                                matched_preferred, len(preferred), semantic_score), 2)
+                if min_score is None or score >= min_score:
+                    scored.append((score, candidate.row, matched_required, matched_preferred, semantic_score))
+            key = lambda item: (-item[0], -item[1])
+            if top_k is not None and top_k < len(scored):
+                return heapq.nsmallest(top_k, scored, key=key), len(scored)
+            return sorted(scored, key=key), len(scored)
+        
+        count = len(pool)
+        matched_required, matched_preferred = pool.match_counts(required, preferred)
+        semantic = pool.semantic_similarities(catalog, entry.index) if entry is not None else None
+        if semantic is None:
+            # No fitted catalog model; word overlap, as rank_catalog falls back to
+            semantic = np.array([self._calculate_semantic_similarity(c.skills, job_skills)
+                                 for c in pool.candidates], dtype=np.float64)
+        scores = np.round(self._final_score(
+            matched_required, np.full(count, len(required)),
+            matched_preferred, np.full(count, len(preferred)), semantic
+        ), 2)
+        
+        rows = np.arange(count)
+        if min_score is not None:
+            rows = np.flatnonzero(scores >= min_score)
+        total = len(rows)
+        
+        # Best score first, most recent candidate among ties
+        order = rows[self._top_k_order(scores[rows], -rows, top_k)]
+        return [(float(scores[row]), int(row), int(matched_required[row]),
+                 int(matched_preferred[row]), float(semantic[row])) for row in order], total
+    
+    def build_candidate_matches(self, job: Dict, pool: CandidatePool, ranked: List[Tuple]) -> List[Dict]:
+        """Result dicts for ranked (score, candidate row, ...) tuples from rank_candidates"""
+        canonicalize = self.skill_index.canonicalize
+        required = [canonicalize(s) for s in job.get('required_skills', [])]
+        preferred = [canonicalize(s) for s in job.get('preferred_skills', [])]
+        
+        matches = []
+        for _, row, matched_required, matched_preferred, semantic_score in ranked:
+            candidate = pool.candidates[row]
+            match_result = self._score_job(
+                candidate.skill_set, required, preferred,
+                matched_required, matched_preferred, semantic_score
             )
-            
             matches.append({
-                'job_id': job['id'],
-                'company_id': job.get('company_id'),
-                'company_name': job.get('company_name', 'Unknown Company'),
-                'company_logo': job.get('company_logo'),
-                'company_website': job.get('company_website'),
-                'job_title': job['title'],
-                'job_description': job.get('description', ''),
-                'experience_level': job.get('experience_level', ''),
-                'location': job.get('location'),
-                'salary_range': job.get('salary_range'),
+                'analysis_id': candidate.analysis_id,
+                'filename': candidate.filename,
+                'user_id': candidate.user_id,
+                'analyzed_at': candidate.created_at,
+                'skills': candidate.skills,
                 'match_score': match_result['overall_score'],
                 'required_score': match_result['required_score'],
                 'preferred_score': match_result['preferred_score'],
                 'matching_required_skills': match_result['matching_required_skills'],
                 'matching_preferred_skills': match_result['matching_preferred_skills'],
                 'missing_required_skills': match_result['missing_required_skills'],
-                'missing_preferred_skills': match_result['missing_preferred_skills'],
-                'total_required_skills': match_result['total_required_skills'],
-                'total_preferred_skills': match_result['total_preferred_skills'],
-                'matched_required_count': match_result['matched_required_count'],
-                'matched_preferred_count': match_result['matched_preferred_count']
+                'missing_preferred_skills': match_result['missing_preferred_skills']
             })
-        
-        # Sort by match score (descending)
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
-        
         return matches
     
-    def generate_improvement_tips(self, missing_skills: List[str], job_title: str) -> List[str]:
-        """Generate improvement tips based on missing skills"""
-        tips = []
-        
-        if not missing_skills:
-            tips.append("Great! You have all the required skills for this position.")
-            return tips
+    @staticmethod
+    def _final_score(matched_required, total_required, matched_preferred, total_preferred, semantic_score):
+        """
+        Final match score; works on plain numbers or NumPy arrays of them
         
-        tips.append(f"To improve your match for {job_title}, consider learning or highlighting:")
+        70% exact match (itself 70% required, 30% preferred) and 30% semantic similarity
+        """
+        if NUMPY_AVAILABLE and isinstance(total_required, np.ndarray):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                required_score = np.where(total_required > 0, matched_required / total_required * 100, 0.0)
+                preferred_score = np.where(total_preferred > 0, matched_preferred / total_preferred * 100, 0.0)
+        else:
+            required_score = matched_required / total_required * 100 if total_required else 0
+            preferred_score = matched_preferred / total_preferred * 100 if total_preferred else 0
+        overall_score = (required_score * 0.7) + (preferred_score * 0.3)
+        return (overall_score * 0.7) + (semantic_score * 0.3)
+    
+    def _match_entry(self, job: Dict, match_result: Dict) -> Dict:
+        """Response entry for one scored job"""
+        return {
+            'job_id': job['id'],
+            'company_id': job.get('company_id'),
+            'company_name': job.get('company_name', 'Unknown Company'),
+            'company_logo': job.get('company_logo'),
+            'company_website': job.get('company_website'),
+            'job_title': job['title'],
+            'job_description': job.get('description', ''),
+            'experience_level': job.get('experience_level', ''),
+            'location': job.get('location'),
+            'salary_range': job.get('salary_range'),
+            'match_score': match_result['overall_score'],
+            'required_score': match_result['required_score'],
+            'preferred_score': match_result['preferred_score'],
+            'matching_required_skills': match_result['matching_required_skills'],
+            'matching_preferred_skills': match_result['matching_preferred_skills'],
+            'missing_required_skills': match_result['missing_required_skills'],
+            'missing_preferred_skills': match_result['missing_preferred_skills'],
+            'total_required_skills': match_result['total_required_skills'],
+            'total_preferred_skills': match_result['total_preferred_skills'],
+            'matched_required_count': match_result['matched_required_count'],
+            'matched_preferred_count': match_result['matched_preferred_count']
+        }
+    
+    def generate_improvement_tips(self, missing_skills: List[str], job_title: str) -> List[str]:
+        """
+        Generate improvement tips based on missing skills
         
-        # Categorize missing skills
-
-        # =========================
-        # Programming Languages
-        # =========================
-        programming_langs = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'python','java','javascript','typescript','c++','c#',' c ',
-                'go','rust','kotlin','swift','php','ruby','scala','perl',
-                'shell','bash','powershell','matlab',' r '
-            ])
-        ]
-
-        # =========================
-        # Core Computer Science
-        # =========================
-        core_cs = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'data structures','algorithms','oop','oops',
-                'object oriented programming',
-                'design patterns','system design',
-                'operating systems','computer networks','dbms',
-                'multithreading','concurrency','memory management'
-            ])
-        ]
-
-        # =========================
-        # Web Fundamentals
-        # =========================
-        web_fundamentals = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'html','css','sass','bootstrap','tailwind',
-                'responsive design','cross browser'
-            ])
-        ]
-
-        # =========================
-        # Frontend Frameworks
-        # =========================
-        frontend = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'react','redux','next.js',
-                'angular','vue','nuxt',
-                'vite','webpack'
-            ])
-        ]
-
-        # =========================
-        # Backend & APIs
-        # =========================
-        backend = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'node.js','express','nestjs',
-                'django','django rest','flask','fastapi',
-                'spring','spring boot',
-                'asp.net','laravel','rails',
-                'rest api','graphql','grpc',
-                'web sockets','api development',
-                'authentication','authorization',
-                'jwt','oauth','session management'
-            ])
-        ]
-
-        # =========================
-        # Databases
-        # =========================
-        databases = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'sql','mysql','postgresql','sqlite','oracle',
-                'mongodb','redis','dynamodb','cassandra',
-                'elasticsearch','neo4j','pl/sql'
-            ])
-        ]
-
-        # =========================
-        # Cloud & DevOps
-        # =========================
-        cloud_devops = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'aws','azure','gcp','cloud',
-                'ec2','s3','rds','lambda','cloud functions',
-                'docker','kubernetes',
-                'ci/cd','jenkins','github actions',
-                'terraform','ansible',
-                'linux','unix',
-                'nginx','apache',
-                'load balancing','auto scaling'
-            ])
-        ]
-
-        # =========================
-        # Monitoring & Logging
-        # =========================
-        monitoring_logging = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'monitoring','prometheus','grafana',
-                'elk','log monitoring'
-            ])
-        ]
-
-        # =========================
-        # Testing & QA
-        # =========================
-        testing = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'unit testing','integration testing',
-                'pytest','junit','jest','mocha',
-                'selenium','cypress',
-                'tdd','bdd','test driven'
-            ])
-        ]
-
-        # =========================
-        # Data Science & Analytics
-        # =========================
-        data_science = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'data analysis','data preprocessing',
-                'feature engineering','data modeling',
-                'pandas','numpy','matplotlib','seaborn',
-                'jupyter','etl','statistics'
-            ])
-        ]
-
-        # =========================
-        # Machine Learning & AI
-        # =========================
-        ml_ai = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'machine learning','deep learning',
-                'supervised learning','unsupervised learning',
-                'neural networks',
-                'tensorflow','pytorch','keras','scikit-learn',
-                'nlp','natural language processing',
-                'computer vision','opencv',
-                'transformers','hugging face',
-                'llms','chatbots',
-                'recommendation systems',
-                'model evaluation','model deployment',
-                'mlops','cuda'
-            ])
-        ]
-
-        # =========================
-        # Mobile Development
-        # =========================
-        mobile = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'android','ios','react native','flutter','xamarin','xcode'
-            ])
-        ]
-
-        # =========================
-        # Security
-        # =========================
-        security = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'security','web security','cloud security',
-                'owasp','xss','csrf','sql injection',
-                'encryption','hashing'
-            ])
-        ]
-
-        # =========================
-        # Tools & Collaboration
-        # =========================
-        tools = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'git','github','gitlab',
-                'jira','confluence',
-                'code review','pull requests'
-            ])
-        ]
-
-        # =========================
-        # Software Methodologies & Architecture
-        # =========================
-        methodologies = [
-            s for s in missing_skills
-            if any(k in s.lower() for k in [
-                'agile','scrum','kanban',
-                'microservices',
-                'monolithic',
-                'serverless',
-                'distributed systems',
-                'performance tuning'
-            ])
-        ]
-
-        softskill = [
-            s for s in missing_skills
-            if any(tool in s.lower() for tool in [
-                'communication', 'leadership', 'teamwork',
-                'problem solving', 'critical thinking',
-                'analytical thinking',
-                'project management', 'time management',
-                'collaboration', 'adaptability',
-                'creativity', 'attention to detail',
-                'decision making', 'initiative',
-                'ownership', 'conflict resolution',
-                'mentorship', 'presentation skills',
-                'documentation', 'multitasking'
-            ])
-        ]
-        # ======================
-        # Suggestions Formatter
-        # ======================
-        if programming_langs:
-            tips.append(f"• Programming Languages: {', '.join(programming_langs)}")
-
-        if core_cs:
-            tips.append(f"• Core CS Concepts: {', '.join(core_cs[:3])}")
-
-        if web_fundamentals:
-            tips.append(f"• Web Fundamentals: {', '.join(web_fundamentals[:3])}")
-
-        if frontend:
-            tips.append(f"• Frontend Skills: {', '.join(frontend[:3])}")
-
-        if backend:
-            tips.append(f"• Backend & APIs: {', '.join(backend[:3])}")
-
-        if databases:
-            tips.append(f"• Databases: {', '.join(databases[:3])}")
-
-        if cloud_devops:
-            tips.append(f"• Cloud & DevOps: {', '.join(cloud_devops[:3])}")
-
-        if monitoring_logging:
-            tips.append(f"• Monitoring & Logging: {', '.join(monitoring_logging[:3])}")
-
-        if testing:
-            tips.append(f"• Testing & QA: {', '.join(testing[:3])}")
-
-        if data_science:
-            tips.append(f"• Data Science & Analytics: {', '.join(data_science[:3])}")
-
-        if ml_ai:
-            tips.append(f"• Machine Learning & AI: {', '.join(ml_ai[:3])}")
-
-        if mobile:
-            tips.append(f"• Mobile Development: {', '.join(mobile[:3])}")
-
-        if security:
-            tips.append(f"• Security: {', '.join(security[:3])}")
-
-        if tools:
-            tips.append(f"• Tools & Collaboration: {', '.join(tools[:3])}")
-
-        if methodologies:
-            tips.append(f"• Software Architecture & Practices: {', '.join(methodologies[:3])}")
-
-
-        if softskill:
-            tips.append(f"• Softskill: {', '.join(softskill[:3])}")
-        # General tips
-        if len(missing_skills) > 5:
-            tips.append("• Consider taking online courses or certifications for the missing skills")
-            tips.append("• Build projects demonstrating these skills")
-            tips.append("• Update your resume to highlight any related experience")
-        
-        return tips
-
+        Tips are memoized on the job title and missing skills, so jobs
+        sharing a title and skill gap reuse the same tip strings.
+        """
+        return list(_improvement_tips(job_title, tuple(missing_skills)))
@@ -0,0 +1,68 @@
+"""
+In-memory LRU of job rankings, keyed by resume skill set
+
+Resumes from one hiring campaign often extract to the same skill set, and
+the same resume is analyzed again with other company filters. A ranking
+depends only on the canonical skill set, the filters and the catalog
+snapshot, so it is cached under
+
+    (hash of the sorted canonical skills, company_id, min_score, catalog version)
+
+The cache belongs to one catalog snapshot: seeing a different one (any
+admin write bumps the catalog version, a taxonomy reload rebuilds the
+catalog) empties it.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+def skill_set_hash(canonical_skills: Iterable[str]) -> str:
+    """SHA-1 hex digest of a canonical skill set (order-insensitive)"""
+    return hashlib.sha1('\n'.join(sorted(set(canonical_skills))).encode('utf-8')).hexdigest()
+
+class MatchCache:
+    """
+    Bounded LRU of (ranked, total) results from JobMatcher.rank_catalog
+
+    A ranking cached for the top K jobs also answers any request for at
+    most K jobs, and a complete ranking answers every request.
+    """
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    def key(self, canonical_skills: Iterable[str], company_id: Optional[int],
+            min_score: Optional[float], catalog) -> Tuple:
+        return (skill_set_hash(canonical_skills), company_id or None, min_score, catalog.version)
+
+    def get(self, key: Tuple, catalog, top_k: Optional[int]) -> Optional[Tuple[List[Tuple], int]]:
+        """Cached (ranked, total) covering the best top_k jobs, or None on a miss"""
+        with self._lock:
+            self._check_catalog(catalog)
+            cached = self._entries.get(key)
+            if cached is not None:
+                ranked, total = cached
+                if len(ranked) == total or (top_k is not None and top_k <= len(ranked)):
+                    self._entries.move_to_end(key)
+                    return ranked[:top_k], total
+            return None
+
+    def put(self, key: Tuple, catalog, ranked: List[Tuple], total: int):
+        with self._lock:
+            self._check_catalog(catalog)
+            cached = self._entries.get(key)
+            # Keep whichever ranking reaches further down the list
+            if cached is None or len(ranked) >= len(cached[0]):
+                self._entries[key] = (ranked, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _check_catalog(self, catalog):
+        # Rankings hold job indices into one snapshot; drop them all for another
+        if catalog is not self._catalog:
+            self._entries.clear()
+            self._catalog = catalog
@@ -0,0 +1,85 @@
+"""
+Content-hash keyed cache of parsed resumes
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+# Bump whenever parser or extractor output changes so stale rows are re-parsed
+CACHE_VERSION = 4
+
+CHUNK_SIZE = 64 * 1024
+
+def hash_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of raw PDF bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 hex digest of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ParseCache:
+    """
+    Bounded in-memory LRU in front of the SQLite parse_cache table.
+
+    Entries hold the cleaned text, sections and extracted skills of a PDF,
+    keyed by the SHA-256 of its bytes. Each entry records the taxonomy
+    fingerprint its skills were extracted with, so a taxonomy reload only
+    re-runs skill extraction, not PDF parsing.
+    """
+    def __init__(self, db, max_entries: int = 256):
+        self.db = db
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Return the cached entry for a content hash, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is not None:
+                self._entries.move_to_end(content_hash)
+                return entry
+
+        row = self.db.get_parse_cache(content_hash)
+        if not row or row['cache_version'] != CACHE_VERSION:
+            return None
+
+        entry = {
+            'content_hash': content_hash,
+            'text': row['text'],
+            'sections': row['sections'],
+            'section_spans': row['section_spans'],
+            'skills': row['skills'],
+            'taxonomy_fingerprint': row['taxonomy_fingerprint']
+        }
+        self._remember(content_hash, entry)
+        return entry
+
+    def put(self, content_hash: str, text: str, sections: Dict, section_spans: Dict,
+            skills: List[str], taxonomy_fingerprint: str) -> Dict:
+        """Store a parse result in memory and in SQLite"""
+        entry = {
+            'content_hash': content_hash,
+            'text': text,
+            'sections': sections,
+            'section_spans': section_spans,
+            'skills': skills,
+            'taxonomy_fingerprint': taxonomy_fingerprint
+        }
+        self.db.save_parse_cache(content_hash, CACHE_VERSION, text, sections, section_spans,
+                                 skills, taxonomy_fingerprint)
+        self._remember(content_hash, entry)
+        return entry
+
+    def _remember(self, content_hash: str, entry: Dict):
+        with self._lock:
+            self._entries[content_hash] = entry
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,255 @@
+"""
+Process-pool PDF parsing with per-document time and page budgets
+"""
+import atexit
+import multiprocessing
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+from .resume_parser import (
+    ResumeParser, ParsedResume, PageLimitExceeded, DEFAULT_BACKEND, extract_page_range, get_backend, open_pdf
+)
+
+class ParseError(Exception):
+    """Parsing failed; status_code is the HTTP status to report"""
+    status_code = 500
+
+class ParseTimeoutError(ParseError):
+    """The document ran past the per-document time budget"""
+    status_code = 422
+
+class ParsePageLimitError(ParseError):
+    """The document has more pages than the page budget"""
+    status_code = 413
+
+class ParseBusyError(ParseError):
+    """No parse worker became free in time"""
+    status_code = 503
+
+def _parse_document(source: Union[str, bytes], max_pages: int, parallel_threshold: int, backend: str):
+    """
+    Parse a PDF and split it into sections (runs inside a worker process)
+
+    Returns (page_count, ParsedResume). Documents longer than
+    parallel_threshold pages are not extracted here; (page_count, None)
+    tells the executor to fan the page range out across workers instead.
+    """
+    started = time.perf_counter()
+    parser = ResumeParser(backend)
+    with open_pdf(source) as pdf:
+        page_count = len(pdf.pages)
+        ResumeParser.check_page_limit(page_count, max_pages)
+        if parallel_threshold and page_count > parallel_threshold:
+            return page_count, None
+        page_texts = [parser.extract_page(page) for page in pdf.pages]
+
+    return page_count, parser.build_result(page_texts, started)
+
+def _split_pages(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """Split range(page_count) into at most `parts` contiguous (start, end) chunks"""
+    parts = max(1, min(parts, page_count))
+    size, extra = divmod(page_count, parts)
+    ranges = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def _worker_loop(conn):
+    """Run tasks received over the pipe until told to stop"""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        func, args = task
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            conn.send((False, e))
+
+class _Worker:
+    """A single parse process with a private pipe, so it can be killed on its own"""
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks_run = 0
+        self.pending = False
+
+    def send(self, func, args):
+        self.tasks_run += 1
+        self.pending = True
+        try:
+            self.conn.send((func, args))
+        except (OSError, ValueError):
+            raise ParseError('Parse worker crashed')
+
+    def receive(self, deadline: float, budget: float):
+        try:
+            if not self.conn.poll(max(0, deadline - time.monotonic())):
+                raise ParseTimeoutError(f"Parsing exceeded the {budget:g}s time limit")
+            ok, value = self.conn.recv()
+        except (EOFError, OSError):
+            raise ParseError('Parse worker crashed')
+        self.pending = False
+        if not ok:
+            raise value
+        return value
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+class ParseExecutor:
+    """
+    Runs ResumeParser in a pool of worker processes.
+
+    Each document gets a wall-clock budget (timeout) and a page budget
+    (max_pages). A worker that runs past its budget is killed and replaced,
+    and workers are recycled after max_tasks_per_worker documents.
+    Documents longer than page_parallel_threshold pages are split into
+    contiguous page ranges extracted on whichever workers are idle, then
+    joined in page order. A pool_size of 0 parses inline in the calling
+    thread.
+    """
+    def __init__(self, pool_size: int = 2, timeout: float = 20, max_pages: int = 50,
+                 max_tasks_per_worker: int = 100, page_parallel_threshold: int = 8,
+                 backend: str = DEFAULT_BACKEND, start_method: str = 'spawn'):
+        get_backend(backend)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.page_parallel_threshold = page_parallel_threshold
+        self.backend = backend
+        self._context = multiprocessing.get_context(start_method)
+        self._workers = []
+        self._lock = threading.Lock()
+        # Idle slots; None means the worker has not been spawned yet
+        self._idle = queue.Queue()
+        for _ in range(pool_size):
+            self._idle.put(None)
+        atexit.register(self.shutdown)
+
+    def parse(self, source: Union[str, bytes]) -> ParsedResume:
+        """
+        Parse a PDF within the configured budgets
+
+        Args:
+            source: Path to the PDF file, or the raw PDF bytes
+
+        Returns:
+            ParsedResume for the document
+        """
+        try:
+            if self.pool_size <= 0:
+                return ResumeParser(self.backend).parse_pdf(source, max_pages=self.max_pages)
+            return self._parse_pooled(source)
+        except PageLimitExceeded as e:
+            raise ParsePageLimitError(str(e))
+        except ParseError:
+            raise
+        except Exception as e:
+            raise ParseError(f"Error parsing PDF: {str(e)}")
+
+    def _parse_pooled(self, source: Union[str, bytes]) -> ParsedResume:
+        workers = [self._checkout(block=True)]
+        # The budget covers parsing only; time queued for a worker is bounded
+        # separately by _checkout, which raises ParseBusyError
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.timeout
+        try:
+            workers[0].send(_parse_document, (source, self.max_pages, self.page_parallel_threshold, self.backend))
+            page_count, result = workers[0].receive(deadline, self.timeout)
+            if result is not None:
+                return result
+
+            # Long document: borrow whatever other workers are idle right now
+            while len(workers) < page_count:
+                worker = self._checkout(block=False)
+                if worker is None:
+                    break
+                workers.append(worker)
+
+            page_texts = self._extract_pages(workers, source, page_count, deadline)
+            return ResumeParser(self.backend).build_result(page_texts, started)
+        finally:
+            for worker in workers:
+                self._release(worker)
+
+    def _extract_pages(self, workers: List[_Worker], source: Union[str, bytes], page_count: int,
+                       deadline: float) -> List[Optional[str]]:
+        ranges = _split_pages(page_count, len(workers))
+        for worker, (start, end) in zip(workers, ranges):
+            worker.send(extract_page_range, (source, start, end, self.backend))
+
+        page_texts = []
+        for worker in workers[:len(ranges)]:
+            page_texts.extend(worker.receive(deadline, self.timeout))
+        return page_texts
+
+    def _checkout(self, block: bool) -> Optional[_Worker]:
+        try:
+            if block:
+                worker = self._idle.get(timeout=self.timeout)
+            else:
+                worker = self._idle.get_nowait()
+        except queue.Empty:
+            if block:
+                raise ParseBusyError('All parse workers are busy, please retry')
+            return None
+
+        if worker is not None and worker.process.is_alive():
+            return worker
+        self._discard(worker)
+        try:
+            return self._spawn()
+        except Exception:
+            self._idle.put(None)
+            raise
+
+    def _release(self, worker: _Worker):
+        # A worker still owing a reply (timed out or crashed) cannot be reused
+        if worker.pending or worker.tasks_run >= self.max_tasks_per_worker:
+            self._discard(worker)
+            worker = None
+        self._idle.put(worker)
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _discard(self, worker: Optional[_Worker]):
+        if worker is None:
+            return
+        worker.kill()
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
@@ -1,88 +1,218 @@
+import io
 import pdfplumber
 import re
-from typing import Optional
+import time
+from typing import Dict, List, Optional, Tuple, Union
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar
+from pdfminer.pdfinterp import PDFPageInterpreter
+
+class PageLimitExceeded(Exception):
+    """Raised when a PDF has more pages than the parse budget allows"""
+    pass
+
+def open_pdf(source: Union[str, bytes]):
+    """Open a PDF from a file path or from its raw bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+def _extract_layout(page) -> Optional[str]:
+    """pdfplumber text with full word/line layout analysis"""
+    return page.extract_text()
+
+def _extract_simple(page) -> Optional[str]:
+    """pdfplumber's plain-text fast path (simple line clustering, no layout)"""
+    return page.extract_text_simple()
+
+def _extract_chars(page) -> Optional[str]:
+    """
+    Raw pdfminer character stream in content order, without layout analysis
+    
+    A line break is emitted when the baseline moves and a space when the gap
+    to the previous glyph is wider than a fraction of the font size.
+    """
+    device = PDFPageAggregator(page.pdf.rsrcmgr, laparams=None)
+    PDFPageInterpreter(page.pdf.rsrcmgr, device).process_page(page.page_obj)
+    
+    parts = []
+    prev = None
+    for item in device.get_result():
+        if not isinstance(item, LTChar):
+            continue
+        if prev is not None:
+            if abs(item.y0 - prev.y0) > prev.size * 0.5:
+                parts.append('\n')
+            elif item.x0 - prev.x1 > prev.size * 0.15:
+                parts.append(' ')
+        parts.append(item.get_text())
+        prev = item
+    return ''.join(parts)
+
+# Page text extraction backends, fastest last
+EXTRACTION_BACKENDS = {
+    'pdfplumber': _extract_layout,
+    'simple': _extract_simple,
+    'chars': _extract_chars
+}
+
+DEFAULT_BACKEND = 'pdfplumber'
+
+def get_backend(name: str):
+    """Look up a page extraction function by backend name"""
+    try:
+        return EXTRACTION_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown PDF text backend '{name}'. Choose from: {', '.join(EXTRACTION_BACKENDS)}"
+        )
+
+def extract_page_range(source: Union[str, bytes], start: int = 0, end: Optional[int] = None,
+                       backend: str = DEFAULT_BACKEND) -> List[Optional[str]]:
+    """
+    Extract the raw text of pages[start:end] of a PDF
+
+    Module-level so parse worker processes can run it on a slice of a
+    long document.
+    """
+    extract = get_backend(backend)
+    with open_pdf(source) as pdf:
+        return [extract(page) for page in pdf.pages[start:end]]
+
+SECTION_NAMES = ('contact', 'summary', 'experience', 'education', 'skills')
+
+# A header is a line shorter than 50 characters containing one of these words;
+# the leftmost word on the line decides the section
+_SECTION_HEADER = re.compile(
+    r'^(?=[^\n]{0,49}$)[^\n]*?(?:'
+    r'(?P<contact>contact|phone|email|address)'
+    r'|(?P<summary>summary|objective|profile|about)'
+    r'|(?P<experience>experience|work history|employment)'
+    r'|(?P<education>education|academic|qualifications)'
+    r'|(?P<skills>skills|competencies|proficiencies)'
+    r')',
+    re.IGNORECASE | re.MULTILINE
+)
+
+_SPECIAL_CHARS = re.compile(r'[^\w\s\.\,\;\:\-\+\(\)]')
+_HORIZONTAL_SPACE = re.compile(r'[^\S\n]+')
+_LINE_BREAKS = re.compile(r' ?\n\s*')
+
+class ParsedResume:
+    """
+    Immutable result of parsing one resume
+
+    Sections are stored as (start, end) character offsets into text rather
+    than copies, so one instance can be shared freely between threads.
+    """
+    __slots__ = ('text', 'page_count', 'section_spans', 'parse_time')
+
+    def __init__(self, text: str, page_count: int, section_spans: Dict[str, Tuple[Tuple[int, int], ...]],
+                 parse_time: float):
+        object.__setattr__(self, 'text', text)
+        object.__setattr__(self, 'page_count', page_count)
+        object.__setattr__(self, 'section_spans', section_spans)
+        object.__setattr__(self, 'parse_time', parse_time)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ParsedResume is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('ParsedResume is immutable')
+
+    def __reduce__(self):
+        return (ParsedResume, (self.text, self.page_count, self.section_spans, self.parse_time))
+
+    def get_section(self, name: str) -> str:
+        """Text of one section (its spans joined by line breaks)"""
+        return ''.join(self.text[start:end] + '\n' for start, end in self.section_spans.get(name, ()))
+
+    @property
+    def sections(self) -> Dict[str, str]:
+        """All sections as a name -> text dict"""
+        return {name: self.get_section(name) for name in SECTION_NAMES}
 
 class ResumeParser:
-    def __init__(self):
-        self.text = ""
+    """
+    Stateless PDF parser; a single instance can be shared across threads
+    """
+    def __init__(self, backend: str = DEFAULT_BACKEND):
+        self.backend = backend
+        self.extract_page = get_backend(backend)
     
-    def parse_pdf(self, file_path: str) -> str:
+    def parse_pdf(self, file_path: Union[str, bytes], max_pages: Optional[int] = None) -> ParsedResume:
         """
         Extract text from PDF resume
         
         Args:
-            file_path: Path to the PDF file
+            file_path: Path to the PDF file, or the raw PDF bytes
+            max_pages: Reject documents with more pages than this (None for no limit)
             
         Returns:
-            Extracted text from the resume
+            ParsedResume with the cleaned text, page count and section offsets
         """
         try:
-            text = ""
+            started = time.perf_counter()
+            with open_pdf(file_path) as pdf:
+                self.check_page_limit(len(pdf.pages), max_pages)
+                page_texts = [self.extract_page(page) for page in pdf.pages]
             
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            # Clean up the text
-            text = self._clean_text(text)
-            self.text = text
-            return text
+            return self.build_result(page_texts, started)
         
+        except PageLimitExceeded:
+            raise
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
+    @staticmethod
+    def check_page_limit(page_count: int, max_pages: Optional[int]):
+        """Raise PageLimitExceeded if a document is over the page budget"""
+        if max_pages and page_count > max_pages:
+            raise PageLimitExceeded(f"PDF has {page_count} pages, the limit is {max_pages}")
+    
+    def build_result(self, page_texts: List[Optional[str]], started: float) -> ParsedResume:
+        """
+        Join per-page text in page order, clean it and locate its sections
+        
+        Args:
+            page_texts: Raw text of each page, in order (None for empty pages)
+            started: time.perf_counter() value when parsing began
+        """
+        text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+        
+        # Clean up the text
+        text = self._clean_text(text)
+        section_spans = self.find_section_spans(text)
+        return ParsedResume(text, len(page_texts), section_spans, time.perf_counter() - started)
+    
     def _clean_text(self, text: str) -> str:
-        """Clean and normalize extracted text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        """Clean and normalize extracted text, keeping one line per text line"""
         # Remove special characters but keep common punctuation
-        text = re.sub(r'[^\w\s\.\,\;\:\-\+\(\)]', ' ', text)
-        # Remove multiple newlines
-        text = re.sub(r'\n+', '\n', text)
+        text = _SPECIAL_CHARS.sub(' ', text)
+        # Collapse runs of spaces and tabs, but not line breaks
+        text = _HORIZONTAL_SPACE.sub(' ', text)
+        # Drop blank lines and the spaces around line breaks
+        text = _LINE_BREAKS.sub('\n', text)
         return text.strip()
     
-    def get_sections(self) -> dict:
-        """Extract common resume sections"""
-        sections = {
-            'contact': '',
-            'summary': '',
-            'experience': '',
-            'education': '',
-            'skills': ''
-        }
-        
-        text_lower = self.text.lower()
-        
-        # Try to find sections by common headers
-        section_patterns = {
-            'contact': r'(contact|phone|email|address)',
-            'summary': r'(summary|objective|profile|about)',
-            'experience': r'(experience|work history|employment|professional experience)',
-            'education': r'(education|academic|qualifications)',
-            'skills': r'(skills|technical skills|competencies|proficiencies)'
-        }
+    def find_section_spans(self, text: str) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+        """
+        Locate common resume sections as (start, end) offsets into text
         
-        lines = self.text.split('\n')
+        A section runs from its header line to the line before the next
+        header. All header lines are found in one scan of the text.
+        """
+        spans = {name: [] for name in SECTION_NAMES}
         current_section = None
+        current_start = 0
         
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            # Check if this line is a section header
-            for section, pattern in section_patterns.items():
-                if re.search(pattern, line_lower) and len(line) < 50:
-                    current_section = section
-                    break
-            
-            # Add line to current section
-            if current_section and line.strip():
-                sections[current_section] += line + '\n'
+        for match in _SECTION_HEADER.finditer(text):
+            if current_section:
+                spans[current_section].append((current_start, match.start() - 1))
+            current_section = match.lastgroup
+            current_start = match.start()
         
-        return sections
-    
-    def get_text(self) -> str:
-        """Get the full extracted text"""
-        return self.text
-
+        if current_section:
+            spans[current_section].append((current_start, len(text)))
+        
+        return {name: tuple(section) for name, section in spans.items()}
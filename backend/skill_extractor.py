@@ -1,243 +1,287 @@
+import bisect
+import importlib.util
 import re
-from typing import List, Set
+import threading
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
 from collections import Counter
-
-# Try to import SpaCy, but make it optional
-try:
-    import spacy
-    SPACY_AVAILABLE = True
-except ImportError:
-    SPACY_AVAILABLE = False
-
-class SkillExtractor:
-    def __init__(self):
-        self.nlp = None
-        if SPACY_AVAILABLE:
-            try:
-                self.nlp = spacy.load("en_core_web_sm")
-            except (OSError, IOError):
-                # SpaCy model not found, continue without it
-                self.nlp = None
-        
-        # Common technical skills database
-        self.technical_skills = {
-
-                # =========================
-                # Programming Languages
-                # =========================
-                'python', 'java', 'javascript', 'typescript', 'c++', 'c', 'c#', 'go', 'rust',
-                'kotlin', 'swift', 'php', 'ruby', 'scala', 'r', 'matlab', 'perl',
-                'shell', 'bash', 'powershell',
-
-                # =========================
-                # Core Computer Science
-                # =========================
-                'data structures', 'algorithms', 'object oriented programming', 'oops','oop',
-                'object oriented programming',
-                'design patterns', 'system design', 'operating systems',
-                'computer networks', 'dbms',
-                'multithreading', 'concurrency', 'memory management',
-
-                # =========================
-                # Web Fundamentals
-                # =========================
-                'html', 'css', 'sass', 'bootstrap', 'tailwind css',
-                'responsive design', 'cross browser compatibility',
-
-                # =========================
-                # Frontend Frameworks
-                # =========================
-                'react', 'redux', 'next.js',
-                'angular', 'vue', 'nuxt.js',
-                'vite', 'webpack',
-
-                # =========================
-                # Backend Frameworks
-                # =========================
-                'node.js', 'express', 'nestjs',
-                'django', 'django rest framework', 'flask', 'fastapi',
-                'spring', 'spring boot',
-                'asp.net', 'laravel', 'rails',
-
-                # =========================
-                # APIs & Communication
-                # =========================
-                'rest api', 'graphql', 'grpc',
-                'web sockets', 'api development',
-                'authentication', 'authorization',
-                'jwt', 'oauth', 'session management',
-
-                # =========================
-                # Databases (SQL & NoSQL)
-                # =========================
-                'sql', 'mysql', 'postgresql', 'sqlite', 'oracle',
-                'mongodb', 'redis', 'dynamodb', 'cassandra',
-                'elasticsearch', 'neo4j',
-
-                # =========================
-                # Cloud Platforms
-                # =========================
-                'aws', 'azure', 'gcp',
-                'aws ec2', 'aws s3', 'aws rds', 'aws lambda',
-                'cloud functions', 'cloud security',
-                'load balancing', 'auto scaling',
-
-                # =========================
-                # DevOps & Infrastructure
-                # =========================
-                'docker', 'kubernetes',
-                'ci/cd', 'jenkins', 'github actions',
-                'terraform', 'ansible',
-                'nginx', 'apache',
-                'linux', 'unix',
-
-                # =========================
-                # Monitoring & Logging
-                # =========================
-                'prometheus', 'grafana',
-                'elk stack', 'log monitoring',
-
-                # =========================
-                # Testing & Quality Assurance
-                # =========================
-                'unit testing', 'integration testing',
-                'pytest', 'junit',
-                'jest', 'mocha',
-                'selenium', 'cypress',
-                'test driven development', 'tdd', 'bdd',
-
-                # =========================
-                # Data Science & Analytics
-                # =========================
-                'data analysis', 'data preprocessing',
-                'feature engineering',
-                'pandas', 'numpy',
-                'matplotlib', 'seaborn',
-                'jupyter',
-
-                # =========================
-                # Machine Learning & AI
-                # =========================
-                'machine learning', 'deep learning',
-                'supervised learning', 'unsupervised learning',
-                'neural networks',
-                'tensorflow', 'pytorch', 'keras',
-                'scikit-learn',
-                'natural language processing', 'nlp',
-                'computer vision',
-                'transformers', 'hugging face',
-                'llms', 'chatbots',
-                'recommendation systems',
-                'model evaluation', 'model deployment',
-                'mlops',
-
-                # =========================
-                # Mobile Development
-                # =========================
-                'android', 'ios',
-                'react native', 'flutter', 'xamarin',
-
-                # =========================
-                # Security
-                # =========================
-                'web security', 'owasp',
-                'sql injection', 'xss', 'csrf',
-                'encryption', 'hashing',
-
-                # =========================
-                # Version Control & Tools
-                # =========================
-                'git', 'github', 'gitlab',
-                'git workflows', 'pull requests',
-                'code review',
-                'jira', 'confluence',
-
-                # =========================
-                # Software Methodologies
-                # =========================
-                'agile', 'scrum', 'kanban',
-                'microservices', 'monolithic architecture',
-                'serverless architecture'
-
-                'firebase','etl','data modeling',
-                'distributed systems','kafka','opencv',
-                'cuda','performance tuning','xcode',
-                'statistics','cloud','monitoring',
-                'security',
+from .skill_matcher import SkillMatcher
+from .skill_index import SkillIndex
+from .skill_taxonomy import CompiledTaxonomy, TaxonomyStore
+
+# SpaCy is optional; it is only imported when the model is first needed
+SPACY_AVAILABLE = importlib.util.find_spec('spacy') is not None
+
+# Noun chunks only need the tagger and parser, so skip the rest of the pipeline
+SPACY_EXCLUDE = ['ner', 'lemmatizer', 'textcat']
+
+# Noun chunks containing one of these words are treated as skills
+NLP_SKILL_HINTS = ('api', 'framework', 'library', 'tool', 'platform')
+
+# Separators between entries of a skills list ("Python, SQL | Docker")
+_SKILL_LIST_DELIMITERS = re.compile(r'[,\n;|\-•]+')
+_SKILL_LIST_ITEM = re.compile(r'[^,\n;|\-•]+')
+
+def _lower_keep_offsets(text: str) -> str:
+    """Lowercase text without changing its length, so offsets stay valid"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') lowercase to two code points; keep those as-is
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+class SkillMention(NamedTuple):
+    """One occurrence of a skill in the resume text"""
+    start: int
+    end: int
+    section: Optional[str]
+
+class SkillExtraction:
+    """
+    Every skill found in a resume, with the spans and sections of its mentions
+
+    Built from the same single scan as the plain skill list, which is
+    available as the skills property.
+    """
+    __slots__ = ('mentions',)
+
+    def __init__(self, mentions: Dict[str, Tuple[SkillMention, ...]]):
+        # skill -> mentions in text order (empty when the position is unknown)
+        self.mentions = mentions
+
+    @classmethod
+    def build(cls, spans: Dict[str, Set[Tuple[int, int]]],
+              section_spans: Optional[Dict[str, Tuple[Tuple[int, int], ...]]] = None) -> 'SkillExtraction':
+        """Sort raw (start, end) spans per skill and tag each with its section"""
+        boundaries = sorted((start, end, name) for name, ranges in (section_spans or {}).items()
+                            for start, end in ranges)
+        starts = [start for start, _, _ in boundaries]
+
+        def section_at(position):
+            i = bisect.bisect_right(starts, position) - 1
+            if i >= 0 and position < boundaries[i][1]:
+                return boundaries[i][2]
+            return None
+
+        return cls({skill: tuple(SkillMention(start, end, section_at(start)) for start, end in sorted(ranges))
+                    for skill, ranges in spans.items()})
+
+    @property
+    def skills(self) -> List[str]:
+        """Sorted skill names (the extract_skills result)"""
+        return sorted(self.mentions)
+
+    @property
+    def counts(self) -> Counter:
+        """Skill -> number of mentions"""
+        return Counter({skill: len(mentions) for skill, mentions in self.mentions.items()})
+
+    def sections(self, skill: str) -> List[str]:
+        """Sections a skill is mentioned in, in text order"""
+        found = []
+        for mention in self.mentions.get(skill, ()):
+            if mention.section and mention.section not in found:
+                found.append(mention.section)
+        return found
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """JSON-friendly skill -> {count, spans, sections}"""
+        return {
+            skill: {
+                'count': len(mentions),
+                'spans': [[mention.start, mention.end] for mention in mentions],
+                'sections': self.sections(skill)
             }
+            for skill, mentions in self.mentions.items()
+        }
 
-            # =========================
-            # Soft Skills
-            # =========================
-        self.soft_skills = {
-                'communication', 'leadership', 'teamwork',
-                'problem solving', 'critical thinking',
-                'analytical thinking',
-                'project management', 'time management',
-                'collaboration', 'adaptability',
-                'creativity', 'attention to detail',
-                'decision making', 'initiative',
-                'ownership', 'conflict resolution',
-                'mentorship', 'presentation skills',
-                'documentation', 'multitasking'
-            }
+class SkillExtractor:
+    def __init__(self, spacy_model: str = 'en_core_web_sm', max_nlp_chars: int = 100000,
+                 nlp_batch_size: int = 32, nlp_n_process: int = 1,
+                 taxonomy_store: Optional[TaxonomyStore] = None):
+        self.spacy_model = spacy_model
+        self.max_nlp_chars = max_nlp_chars
+        self.nlp_batch_size = nlp_batch_size
+        self.nlp_n_process = nlp_n_process
+        self._nlp = None
+        self._nlp_loaded = False
+        self._nlp_lock = threading.Lock()
+        # Skill vocabulary, matcher and alias index come from the compiled
+        # taxonomy artifact and can be swapped at runtime
+        self.taxonomy_store = taxonomy_store or TaxonomyStore()
+
+    @property
+    def taxonomy(self) -> CompiledTaxonomy:
+        """The live taxonomy; take one snapshot per extraction"""
+        return self.taxonomy_store.current()
+
+    @property
+    def technical_skills(self) -> FrozenSet[str]:
+        return self.taxonomy.technical_skills
+
+    @property
+    def soft_skills(self) -> FrozenSet[str]:
+        return self.taxonomy.soft_skills
+
+    @property
+    def matcher(self) -> SkillMatcher:
+        return self.taxonomy.matcher
+
+    @property
+    def skill_index(self) -> SkillIndex:
+        return self.taxonomy.skill_index
 
     
-    def extract_skills(self, resume_text: str) -> List[str]:
+    @property
+    def nlp(self):
+        """SpaCy pipeline, loaded on first use (None if SpaCy or the model is missing)"""
+        if not self._nlp_loaded:
+            with self._nlp_lock:
+                if not self._nlp_loaded:
+                    self._nlp = self._load_nlp()
+                    self._nlp_loaded = True
+        return self._nlp
+    
+    def _load_nlp(self):
+        if not SPACY_AVAILABLE:
+            return None
+        try:
+            import spacy
+            return spacy.load(self.spacy_model, exclude=SPACY_EXCLUDE)
+        except (OSError, IOError):
+            # SpaCy model not found, continue without it
+            return None
+    
+    def extract_skills(self, resume_text: str,
+                       section_spans: Optional[Dict[str, Tuple[Tuple[int, int], ...]]] = None) -> List[str]:
         """
         Extract skills from resume text using NLP
         
         Args:
             resume_text: Text content from resume
+            section_spans: Section offsets from ParsedResume; when given, the
+                skills section is read from its spans instead of re-scanning lines
             
         Returns:
             List of extracted skills
         """
-        skills = set()
-        text_lower = resume_text.lower()
-        
-        # Extract technical skills
-        for skill in self.technical_skills:
-            skill_lower = skill.lower()
-            escaped_skill = re.escape(skill_lower)
+        return self.extract_skill_mentions(resume_text, section_spans).skills
+    
+    def extract_skill_mentions(self, resume_text: str,
+                               section_spans: Optional[Dict[str, Tuple[Tuple[int, int], ...]]] = None) -> SkillExtraction:
+        """
+        Extract skills together with where and how often each one occurs
         
-            # Use \b for normal words, lookarounds for symbol-based skills
-            if skill_lower.isalnum():
-                pattern = r'\b' + escaped_skill + r'\b'
-            else:
-                pattern = r'(?<!\w)' + escaped_skill + r'(?!\w)'
+        Args:
+            resume_text: Text content from resume
+            section_spans: Section offsets from ParsedResume; also used to
+                tag each mention with the section containing it
+            
+        Returns:
+            SkillExtraction with the character spans of every mention
+        """
+        mentions = self._extract_pattern_mentions(resume_text, section_spans)
         
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                skills.add(skill)
-
+        # Use NLP to find noun phrases that might be skills (if SpaCy is available)
+        nlp = self.nlp
+        if nlp:
+            try:
+                for skill, span in self._skills_from_doc(nlp(resume_text[:self.max_nlp_chars])):
+                    mentions.setdefault(skill, set()).add(span)
+            except:
+                # If NLP processing fails, continue without it
+                pass
         
-        # Extract soft skills
-        for skill in self.soft_skills:
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                skills.add(skill)
+        return SkillExtraction.build(mentions, section_spans)
+    
+    def extract_skills_batch(self, resume_texts: List[str],
+                             section_spans: Optional[List[Optional[Dict]]] = None,
+                             batch_size: Optional[int] = None,
+                             n_process: Optional[int] = None) -> List[List[str]]:
+        """
+        Extract skills from many resumes, running SpaCy over them with nlp.pipe
         
-        # Look for skills section explicitly
-        skills_section = self._find_skills_section(resume_text)
-        if skills_section:
-            skills.update(self._extract_from_skills_section(skills_section))
+        Args:
+            resume_texts: Text content of each resume
+            section_spans: Optional section offsets per resume (same order)
+            batch_size: Texts per nlp.pipe batch (defaults to nlp_batch_size)
+            n_process: SpaCy worker processes (defaults to nlp_n_process)
+            
+        Returns:
+            List of extracted skills per resume, in input order
+        """
+        return [extraction.skills for extraction in
+                self.extract_skill_mentions_batch(resume_texts, section_spans, batch_size, n_process)]
+    
+    def extract_skill_mentions_batch(self, resume_texts: List[str],
+                                     section_spans: Optional[List[Optional[Dict]]] = None,
+                                     batch_size: Optional[int] = None,
+                                     n_process: Optional[int] = None) -> List[SkillExtraction]:
+        """Batch version of extract_skill_mentions (see extract_skills_batch)"""
+        spans_list = section_spans or [None] * len(resume_texts)
+        results = [self._extract_pattern_mentions(text, spans)
+                   for text, spans in zip(resume_texts, spans_list)]
         
-        # Use NLP to find noun phrases that might be skills (if SpaCy is available)
-        if self.nlp:
+        nlp = self.nlp
+        if nlp and resume_texts:
             try:
-                doc = self.nlp(resume_text)
-                # Extract technical terms (nouns that are likely technologies)
-                for chunk in doc.noun_chunks:
-                    chunk_text = chunk.text.lower().strip()
-                    if len(chunk_text) > 2 and len(chunk_text) < 30:
-                        # Check if it's a known technology or tool
-                        if any(tech in chunk_text for tech in ['api', 'framework', 'library', 'tool', 'platform']):
-                            skills.add(chunk_text)
+                docs = nlp.pipe(
+                    (text[:self.max_nlp_chars] for text in resume_texts),
+                    batch_size=batch_size or self.nlp_batch_size,
+                    n_process=n_process or self.nlp_n_process
+                )
+                for mentions, doc in zip(results, docs):
+                    for skill, span in self._skills_from_doc(doc):
+                        mentions.setdefault(skill, set()).add(span)
             except:
                 # If NLP processing fails, continue without it
                 pass
         
-        return sorted(list(skills))
+        return [SkillExtraction.build(mentions, spans) for mentions, spans in zip(results, spans_list)]
+    
+    def _skills_from_doc(self, doc) -> Iterable[Tuple[str, Tuple[int, int]]]:
+        """Technical terms among a parsed document's noun chunks, with their spans"""
+        for chunk in doc.noun_chunks:
+            chunk_text = chunk.text.lower().strip()
+            if len(chunk_text) > 2 and len(chunk_text) < 30:
+                # Check if it's a known technology or tool
+                if any(tech in chunk_text for tech in NLP_SKILL_HINTS):
+                    yield chunk_text, (chunk.start_char, chunk.end_char)
+    
+    def _extract_pattern_mentions(self, resume_text: str,
+                                  section_spans: Optional[Dict[str, Tuple[Tuple[int, int], ...]]]) -> Dict[str, Set[Tuple[int, int]]]:
+        """Spans of skills found by the skill matcher and the skills section (no NLP)"""
+        mentions = {}
+        text_lower = _lower_keep_offsets(resume_text)
+        taxonomy = self.taxonomy
+        
+        # Extract technical and soft skills
+        for start, end, skill in taxonomy.matcher.finditer(text_lower):
+            mentions.setdefault(skill, set()).add((start, end))
+        
+        # Look for skills section explicitly; a list entry that overlaps a
+        # mention matched above (e.g. 'react.js' around 'react') is the same
+        # mention, so it is not counted twice
+        if section_spans is not None and section_spans.get('skills'):
+            for section_start, section_end in section_spans['skills']:
+                for fragment in _SKILL_LIST_ITEM.finditer(text_lower, section_start, section_end):
+                    canonical = taxonomy.skill_index.canonical(fragment.group())
+                    if canonical:
+                        start = fragment.start() + len(fragment.group()) - len(fragment.group().lstrip())
+                        end = fragment.start() + len(fragment.group().rstrip())
+                        spans = mentions.setdefault(canonical, set())
+                        if not any(start < other_end and other_start < end for other_start, other_end in spans):
+                            spans.add((start, end))
+        else:
+            # No skills span from the parser (or no offsets at all): fall back
+            # to the keyword search, e.g. for a 'Core Competencies' header
+            # the parser filed under another section
+            skills_section = self._find_skills_section(resume_text)
+            if skills_section:
+                # Without a skills span the positions are unknown
+                for skill in self._extract_from_skills_section(skills_section, taxonomy.skill_index):
+                    mentions.setdefault(skill, set())
+        
+        return mentions
     
     def _find_skills_section(self, text: str) -> str:
         """Find the skills section in resume"""
@@ -260,24 +304,19 @@ class SkillExtractor:
         return skills_section
 
 
-    def _extract_from_skills_section(self, skills_text: str) -> Set[str]:
+    def _extract_from_skills_section(self, skills_text: str,
+                                     skill_index: Optional[SkillIndex] = None) -> Set[str]:
         skills = set()
+        skill_index = skill_index or self.skill_index
 
         # Split using ALL delimiters
-        parts = re.split(r'[,\n;|\-•]+', skills_text.lower())
-
-        # Sort to make order deterministic
-        known_skills = sorted(self.technical_skills | self.soft_skills, key=str.lower)
+        parts = _SKILL_LIST_DELIMITERS.split(skills_text.lower())
 
+        # One hash lookup per fragment resolves known skills and their aliases
         for part in parts:
-            skill = part.strip()
-            if len(skill) <= 2:
-                continue
-
-            for known_skill in known_skills:
-                if skill == known_skill.lower():
-                    skills.add(known_skill)
-                    break
+            canonical = skill_index.canonical(part)
+            if canonical:
+                skills.add(canonical)
 
         return skills
 
@@ -0,0 +1,37 @@
+"""
+Canonical skill index: maps skill aliases and spellings to one canonical name
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_skill(skill: str) -> str:
+    """Lowercase, trim and collapse inner whitespace"""
+    return _WHITESPACE.sub(' ', skill.lower().strip())
+
+class SkillIndex:
+    """
+    Hash index from normalized alias to canonical skill, built once
+
+    Lookups are O(1) per token, so both resume skills-section parsing and
+    job matching can resolve spellings like "k8s" or "react.js" without
+    scanning the vocabulary. The alias map ships in the skill taxonomy
+    (data/skill_taxonomy.json).
+    """
+    def __init__(self, skills: Iterable[str] = (), aliases: Optional[Dict[str, str]] = None):
+        self.lookup: Dict[str, str] = {}
+        for alias, canonical in (aliases or {}).items():
+            self.lookup[normalize_skill(alias)] = canonical
+        # Known skills always map to themselves, even if also listed as an alias
+        for skill in skills:
+            self.lookup[normalize_skill(skill)] = skill
+
+    def canonical(self, skill: str) -> Optional[str]:
+        """Canonical name for a skill or alias, or None if unknown"""
+        return self.lookup.get(normalize_skill(skill))
+
+    def canonicalize(self, skill: str) -> str:
+        """Canonical name if known, otherwise the normalized input"""
+        normalized = normalize_skill(skill)
+        return self.lookup.get(normalized, normalized)
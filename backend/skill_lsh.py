@@ -0,0 +1,132 @@
+"""
+MinHash / LSH candidate retrieval over job skill sets
+
+For very large catalogs, exact scoring is limited to the jobs an LSH
+index retrieves for the resume. Each job's canonical skill set gets a
+MinHash signature of bands * rows hash functions; the signature is cut
+into bands, and a job is a candidate when any band equals the resume's.
+A job whose skill set has Jaccard similarity J with the resume is
+retrieved with probability
+
+    1 - (1 - J ** rows) ** bands
+
+so more bands raise recall and more rows per band shrink the candidate
+set. Only skills some job lists are hashed, since other resume skills
+cannot match anything.
+
+Requires NumPy.
+"""
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+# Hash functions h(x) = (a * x + b) mod p; with p < 2**31 the products fit in uint64
+MERSENNE_PRIME = (1 << 31) - 1
+EMPTY_HASH = MERSENNE_PRIME
+
+# Jobs hashed per chunk while building signatures, bounding memory
+SIGNATURE_CHUNK = 20000
+
+def retrieval_probability(jaccard: float, bands: int, rows: int) -> float:
+    """Chance that a job with this Jaccard similarity to the resume is retrieved"""
+    return 1 - (1 - jaccard ** rows) ** bands
+
+class SkillLSH:
+    """
+    Banded MinHash index of job skill sets
+
+    Per band, the band keys of all indexed jobs are kept sorted next to
+    their job indices, so a query is one binary search per band.
+    """
+    def __init__(self, skill_sets: List[Iterable[str]], bands: int = 16, rows: int = 1, seed: int = 1):
+        """
+        Args:
+            skill_sets: Canonical skills of each job, by job index
+            bands: Number of bands (more raises recall)
+            rows: Hash functions per band (more shrinks the candidate set)
+            seed: Seed for the hash functions
+        """
+        if bands < 1 or rows < 1:
+            raise ValueError('bands and rows must be at least 1')
+        self.bands = bands
+        self.rows = rows
+        self.job_count = len(skill_sets)
+
+        self.skill_ids: Dict[str, int] = {}
+        job_rows, skill_columns = [], []
+        for index, skills in enumerate(skill_sets):
+            for skill in set(skills):
+                job_rows.append(index)
+                skill_columns.append(self.skill_ids.setdefault(skill, len(self.skill_ids)))
+
+        rng = np.random.default_rng(seed)
+        num_perm = bands * rows
+        a = rng.integers(1, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        b = rng.integers(0, MERSENNE_PRIME, num_perm, dtype=np.uint64)
+        ids = np.arange(1, len(self.skill_ids) + 1, dtype=np.uint64)
+        # Hash of every known skill under every hash function
+        self.skill_hashes = ((ids[:, np.newaxis] * a + b) % np.uint64(MERSENNE_PRIME)).astype(np.uint32)
+        # Combines the rows of a band into one key
+        self.band_multipliers = rng.integers(1, 1 << 62, rows, dtype=np.uint64) | np.uint64(1)
+
+        signatures = self._job_signatures(np.array(job_rows, dtype=np.int64),
+                                          np.array(skill_columns, dtype=np.int64))
+        # Jobs without skills are never retrieved (they cannot share one)
+        self.indexed = np.unique(np.array(job_rows, dtype=np.int64))
+        keys = self._band_keys(signatures[self.indexed])
+        order = np.argsort(keys, axis=0, kind='stable')
+        # (bands, jobs) arrays; 8 bytes per job and band
+        self.sorted_keys = np.ascontiguousarray(np.take_along_axis(keys, order, axis=0).T)
+        self.order = np.ascontiguousarray(self.indexed[order].T.astype(np.int32))
+
+    def _job_signatures(self, job_rows, skill_columns):
+        signatures = np.full((self.job_count, self.skill_hashes.shape[1]), EMPTY_HASH, dtype=np.uint32)
+        if not len(job_rows):
+            return signatures
+        # job_rows is grouped by job; reduce each group with one minimum.reduceat
+        starts = np.flatnonzero(np.r_[True, job_rows[1:] != job_rows[:-1]])
+        for chunk_start in range(0, len(starts), SIGNATURE_CHUNK):
+            chunk = starts[chunk_start:chunk_start + SIGNATURE_CHUNK]
+            end = starts[chunk_start + SIGNATURE_CHUNK] if chunk_start + SIGNATURE_CHUNK < len(starts) \
+                else len(job_rows)
+            hashes = self.skill_hashes[skill_columns[chunk[0]:end]]
+            signatures[job_rows[chunk]] = np.minimum.reduceat(hashes, chunk - chunk[0], axis=0)
+        return signatures
+
+    def _band_keys(self, signatures):
+        """(n, bands) uint32 keys from (n, bands * rows) signatures"""
+        if self.rows == 1:
+            return signatures.reshape(len(signatures), self.bands)
+        banded = signatures.reshape(len(signatures), self.bands, self.rows).astype(np.uint64)
+        # Wrapping uint64 arithmetic is intended here; a truncated key only
+        # collides by chance, adding a false candidate that exact scoring ranks
+        return ((banded * self.band_multipliers).sum(axis=2, dtype=np.uint64) >> np.uint64(32)).astype(np.uint32)
+
+    def signature(self, skills: Iterable[str]):
+        """MinHash signature of a skill set, or None if no job lists any of its skills"""
+        columns = [self.skill_ids[s] for s in set(skills) if s in self.skill_ids]
+        if not columns:
+            return None
+        return self.skill_hashes[columns].min(axis=0)
+
+    def query(self, skills: Iterable[str]):
+        """
+        Jobs sharing at least one band with a skill set
+
+        Returns:
+            Sorted int64 array of job indices
+        """
+        signature = self.signature(skills)
+        if signature is None or not len(self.indexed):
+            return np.empty(0, dtype=np.int64)
+        keys = self._band_keys(signature[np.newaxis, :])[0]
+        found = []
+        for band, key in enumerate(keys):
+            sorted_keys = self.sorted_keys[band]
+            start = np.searchsorted(sorted_keys, key, side='left')
+            stop = np.searchsorted(sorted_keys, key, side='right')
+            if stop > start:
+                found.append(self.order[band, start:stop])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(found)).astype(np.int64)
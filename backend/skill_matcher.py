@@ -0,0 +1,69 @@
+"""
+Multi-pattern skill matcher
+"""
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+_WORD_RUN = re.compile(r'\w+')
+_WORD_CHAR = re.compile(r'\w')
+
+class SkillMatcher:
+    """
+    Finds every known skill in a text in one linear pass.
+
+    A skill only matches where it is not preceded or followed by a word
+    character, the same rule as the (?<!\\w)skill(?!\\w) regex per skill.
+    Every skill starts with a word character, so a match can only begin
+    where a \\w+ run begins, and that run must equal the skill's first run.
+    The matcher therefore walks the text's word runs once (one compiled
+    regex scan) and looks each run up in a hash index from first run to
+    candidate skills. That gives the same results as running one regex per
+    skill, but scans the text once instead of once per skill, and handles
+    symbol skills such as c++, c#, node.js and ci/cd.
+    """
+    def __init__(self, skills: Iterable[str]):
+        # first word run -> [(lowercased skill, skill)], longest first
+        self.index: Dict[str, List[Tuple[str, str]]] = {}
+        # skills that do not start with a word character (matched by regex)
+        self.fallback: List[Tuple[re.Pattern, str]] = []
+
+        for skill in skills:
+            key = skill.lower()
+            first_run = _WORD_RUN.match(key)
+            if first_run:
+                self.index.setdefault(first_run.group(), []).append((key, skill))
+            else:
+                pattern = re.compile(r'(?<!\w)' + re.escape(key) + r'(?!\w)')
+                self.fallback.append((pattern, skill))
+
+        for candidates in self.index.values():
+            candidates.sort(key=lambda item: (-len(item[0]), item[0]))
+
+    def finditer(self, text_lower: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (start, end, skill) for every occurrence in already-lowercased text
+
+        Overlapping matches are all reported (e.g. both "spring" and
+        "spring boot").
+        """
+        index = self.index
+        startswith = text_lower.startswith
+        word_char = _WORD_CHAR.match
+
+        for run in _WORD_RUN.finditer(text_lower):
+            candidates = index.get(run.group())
+            if not candidates:
+                continue
+            start = run.start()
+            for key, skill in candidates:
+                end = start + len(key)
+                if startswith(key, start) and not word_char(text_lower, end):
+                    yield start, end, skill
+
+        for pattern, skill in self.fallback:
+            for match in pattern.finditer(text_lower):
+                yield match.start(), match.end(), skill
+
+    def find(self, text_lower: str) -> set:
+        """Set of skills occurring in already-lowercased text"""
+        return {skill for _, _, skill in self.finditer(text_lower)}
@@ -0,0 +1,188 @@
+"""
+Versioned skill taxonomy: source data file, compiled artifact and hot reload
+
+The vocabulary lives in data/skill_taxonomy.json. It is compiled offline
+into a pickled artifact holding the ready-built SkillMatcher, SkillIndex
+and skill -> category map, so workers load it in milliseconds:
+
+    python -m backend.skill_taxonomy compile
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from typing import Dict, FrozenSet
+
+from .skill_index import SkillIndex
+from .skill_matcher import SkillMatcher
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+DEFAULT_SOURCE_PATH = os.path.join(DATA_DIR, 'skill_taxonomy.json')
+DEFAULT_ARTIFACT_PATH = os.path.join(DATA_DIR, 'skill_taxonomy.pkl')
+
+SOFT_SKILLS_CATEGORY = 'Soft Skills'
+
+# Bump whenever CompiledTaxonomy, SkillMatcher or SkillIndex change shape so
+# artifacts pickled by older code are recompiled instead of loaded
+ARTIFACT_FORMAT_VERSION = 1
+
+class CompiledTaxonomy:
+    """Ready-to-use skill structures built from one taxonomy version"""
+    def __init__(self, version: int, source_sha256: str, technical_skills: FrozenSet[str],
+                 soft_skills: FrozenSet[str], categories: Dict[str, str], aliases: Dict[str, str]):
+        self.version = version
+        self.source_sha256 = source_sha256
+        self.format_version = ARTIFACT_FORMAT_VERSION
+        self.technical_skills = technical_skills
+        self.soft_skills = soft_skills
+        # skill -> category name
+        self.categories = categories
+        self.matcher = SkillMatcher(technical_skills | soft_skills)
+        self.skill_index = SkillIndex(technical_skills | soft_skills, aliases)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the exact vocabulary, e.g. for invalidating cached skills"""
+        return f"{self.version}-{self.source_sha256[:12]}"
+
+    @property
+    def skill_count(self) -> int:
+        return len(self.technical_skills) + len(self.soft_skills)
+
+def _sha256_file(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def compile_taxonomy(source_path: str = DEFAULT_SOURCE_PATH) -> CompiledTaxonomy:
+    """Build a CompiledTaxonomy from the JSON source file"""
+    with open(source_path, encoding='utf-8') as f:
+        source = json.load(f)
+
+    categories = {}
+    for category, skills in source['technical_skills'].items():
+        for skill in skills:
+            if skill in categories:
+                raise ValueError(f"Skill '{skill}' is listed under both {categories[skill]} and {category}")
+            categories[skill] = category
+    for skill in source['soft_skills']:
+        categories[skill] = SOFT_SKILLS_CATEGORY
+
+    technical_skills = frozenset(skill for skills in source['technical_skills'].values() for skill in skills)
+    return CompiledTaxonomy(
+        version=int(source['version']),
+        source_sha256=_sha256_file(source_path),
+        technical_skills=technical_skills,
+        soft_skills=frozenset(source['soft_skills']),
+        categories=categories,
+        aliases=source.get('aliases', {})
+    )
+
+def write_artifact(taxonomy: CompiledTaxonomy, artifact_path: str = DEFAULT_ARTIFACT_PATH):
+    """Pickle a compiled taxonomy, replacing any existing artifact atomically"""
+    tmp_path = f"{artifact_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(taxonomy, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+
+def load_taxonomy(source_path: str = DEFAULT_SOURCE_PATH,
+                  artifact_path: str = DEFAULT_ARTIFACT_PATH) -> CompiledTaxonomy:
+    """
+    Load the compiled artifact, recompiling from source if it is missing
+    or was built from a different version of the source file or by code
+    with a different artifact format
+    """
+    source_sha256 = _sha256_file(source_path) if os.path.exists(source_path) else None
+    try:
+        with open(artifact_path, 'rb') as f:
+            taxonomy = pickle.load(f)
+        current_format = getattr(taxonomy, 'format_version', None) == ARTIFACT_FORMAT_VERSION
+        if current_format and (source_sha256 is None or taxonomy.source_sha256 == source_sha256):
+            return taxonomy
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+        pass
+
+    taxonomy = compile_taxonomy(source_path)
+    try:
+        write_artifact(taxonomy, artifact_path)
+    except OSError:
+        # Read-only deploys still work; they just compile at boot
+        pass
+    return taxonomy
+
+class TaxonomyStore:
+    """
+    Holds the live taxonomy and swaps in new versions without a restart.
+
+    current() re-checks the source and artifact modification times at most
+    every check_interval seconds, so every worker process picks up a new
+    file on its own; reload() forces the check. The swap is a single
+    reference assignment, so readers that took a snapshot keep a
+    consistent version.
+    """
+    def __init__(self, source_path: str = DEFAULT_SOURCE_PATH,
+                 artifact_path: str = DEFAULT_ARTIFACT_PATH, check_interval: float = 30):
+        self.source_path = source_path
+        self.artifact_path = artifact_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtimes = self._file_mtimes()
+        self._taxonomy = load_taxonomy(source_path, artifact_path)
+        self._next_check = time.monotonic() + check_interval
+
+    def current(self) -> CompiledTaxonomy:
+        """The live taxonomy (reloaded first if its files changed)"""
+        if self.check_interval and time.monotonic() >= self._next_check:
+            self._reload_if_changed()
+        return self._taxonomy
+
+    def reload(self) -> CompiledTaxonomy:
+        """Reload from disk now and return the new live taxonomy"""
+        with self._lock:
+            self._mtimes = self._file_mtimes()
+            self._taxonomy = load_taxonomy(self.source_path, self.artifact_path)
+            self._next_check = time.monotonic() + self.check_interval
+            return self._taxonomy
+
+    def _reload_if_changed(self):
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return
+            self._next_check = time.monotonic() + self.check_interval
+            mtimes = self._file_mtimes()
+            if mtimes == self._mtimes:
+                return
+            try:
+                self._taxonomy = load_taxonomy(self.source_path, self.artifact_path)
+                self._mtimes = mtimes
+            except (OSError, ValueError, KeyError):
+                # Keep serving the previous version if the new file is broken
+                pass
+
+    def _file_mtimes(self):
+        mtimes = []
+        for path in (self.source_path, self.artifact_path):
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+def main():
+    parser = argparse.ArgumentParser(description='Skill taxonomy tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compile_cmd = subparsers.add_parser('compile', help='Compile the JSON taxonomy into the loadable artifact')
+    compile_cmd.add_argument('--source', default=DEFAULT_SOURCE_PATH)
+    compile_cmd.add_argument('--output', default=DEFAULT_ARTIFACT_PATH)
+
+    args = parser.parse_args()
+    if args.command == 'compile':
+        taxonomy = compile_taxonomy(args.source)
+        write_artifact(taxonomy, args.output)
+        print(f"Compiled taxonomy v{taxonomy.version}: {taxonomy.skill_count} skills, "
+              f"{len(taxonomy.skill_index.lookup)} index entries -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Durable background task queue backed by the SQLite tasks table
+
+The API enqueues uploads and analyses and returns a task id at once;
+worker processes claim tasks, run them through the app's task handlers
+and store the result for GET /api/tasks/<id>.
+
+Workers normally run inside the app (Config.TASK_WORKERS per app
+process). To run them as a separate service instead, set TASK_WORKERS=0
+for the web process and start:
+
+    python -m backend.task_queue --workers 4
+"""
+import argparse
+import atexit
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from .config import Config
+from .database import Database
+
+TASK_KINDS = ('upload', 'analyze')
+
+# Module providing run_task(kind, payload) -> (result dict, HTTP status code)
+DEFAULT_HANDLER_MODULE = 'backend.app'
+
+def release_spool(kind: str, payload: Dict):
+    """Delete the spooled copy of an upload task's PDF, if it has one"""
+    if kind == 'upload' and payload.get('spooled'):
+        try:
+            os.remove(payload['path'])
+        except OSError:
+            pass
+
+class TaskQueue:
+    """Enqueue, claim and complete tasks stored in SQLite"""
+    def __init__(self, db: Database, stale_after: float = 300, max_attempts: int = 3):
+        self.db = db
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+
+    def enqueue(self, kind: str, payload: Dict) -> str:
+        """Queue a task and return its id"""
+        if kind not in TASK_KINDS:
+            raise ValueError(f"Unknown task kind: {kind}")
+        return self.db.create_task(uuid.uuid4().hex, kind, payload, time.time())
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Take the next runnable task for this process, or None if there is none
+
+        Tasks that ran out of attempts on the way are failed and their
+        spooled uploads deleted.
+        """
+        now = time.time()
+        return self.db.claim_task(os.getpid(), now, now - self.stale_after, self.max_attempts,
+                                  on_exhausted=release_spool)
+
+    def finish(self, task_id: str, result: Dict, status_code: int):
+        status = 'done' if status_code < 400 else 'failed'
+        self.db.finish_task(task_id, status, result, status_code, time.time())
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        return self.db.get_task(task_id)
+
+def _worker_main(db_path: str, handler_module: str, poll_interval: float,
+                 stale_after: float, max_attempts: int):
+    """Claim and run tasks until the process is terminated"""
+    run_task = importlib.import_module(handler_module).run_task
+    task_queue = TaskQueue(Database(db_path), stale_after, max_attempts)
+    while True:
+        task = task_queue.claim()
+        if task is None:
+            time.sleep(poll_interval)
+            continue
+        try:
+            result, status_code = run_task(task['kind'], task['payload'])
+        except Exception as e:
+            result, status_code = {'error': str(e)}, 500
+        task_queue.finish(task['id'], result, status_code)
+
+class TaskWorkers:
+    """
+    A fixed number of worker processes draining the task queue
+
+    Workers are started on first use. They are not daemonic, so each can
+    run its own parse executor; shutdown() (registered with atexit)
+    terminates them. A task whose worker died is picked up again once it
+    has been running for stale_after seconds.
+    """
+    def __init__(self, db_path: str, count: int = 2, handler_module: str = DEFAULT_HANDLER_MODULE,
+                 poll_interval: float = 0.5, stale_after: float = 300, max_attempts: int = 3):
+        self.db_path = db_path
+        self.count = count
+        self.handler_module = handler_module
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.max_attempts = max_attempts
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = []
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def ensure_started(self):
+        """Start (or restart dead) worker processes"""
+        with self._lock:
+            self._processes = [process for process in self._processes if process.is_alive()]
+            while len(self._processes) < self.count:
+                process = self._context.Process(
+                    target=_worker_main,
+                    args=(self.db_path, self.handler_module, self.poll_interval,
+                          self.stale_after, self.max_attempts),
+                    name='task-worker'
+                )
+                process.start()
+                self._processes.append(process)
+
+    def join(self):
+        for process in list(self._processes):
+            process.join()
+
+    def shutdown(self):
+        with self._lock:
+            for process in self._processes:
+                if process.is_alive():
+                    process.terminate()
+            for process in self._processes:
+                process.join(timeout=5)
+            self._processes = []
+
+def main():
+    parser = argparse.ArgumentParser(description='Run background task workers')
+    parser.add_argument('--workers', type=int, default=max(Config.TASK_WORKERS, 1),
+                        help='Worker processes (default: TASK_WORKERS or 1)')
+    args = parser.parse_args()
+
+    workers = TaskWorkers(Database().db_path, args.workers,
+                          poll_interval=Config.TASK_POLL_INTERVAL,
+                          stale_after=Config.TASK_STALE_AFTER,
+                          max_attempts=Config.TASK_MAX_ATTEMPTS)
+    workers.ensure_started()
+    print(f"Started {args.workers} task workers")
+    try:
+        workers.join()
+    except KeyboardInterrupt:
+        workers.shutdown()
+
+if __name__ == '__main__':
+    main()
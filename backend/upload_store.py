@@ -0,0 +1,99 @@
+"""
+Content-addressed storage for uploaded resumes
+
+Each distinct PDF is stored once, under its SHA-256:
+
+    uploads/ab/cd/abcd1234....pdf
+
+Every upload gets its own opaque upload id mapped to that content hash,
+and the blob keeps a reference count so it is deleted only when the
+last upload pointing at it is released.
+"""
+import os
+import threading
+import uuid
+from typing import Dict, Optional
+
+from .upload_stream import AsyncUploadWriter
+
+SHARD_DEPTH = 2
+SHARD_WIDTH = 2
+# put() and release() of the same content hash are serialised through one
+# of these locks, so a release never deletes a blob a concurrent put re-created
+LOCK_STRIPES = 64
+
+class UploadStore:
+    def __init__(self, root: str, db, writer: Optional[AsyncUploadWriter] = None, persist: bool = True):
+        """
+        Args:
+            root: Directory holding the sharded blobs
+            db: Database with the uploads and upload_blobs tables
+            writer: Background writer for new blobs (created if not given)
+            persist: Store the PDF bytes; when False only the upload id ->
+                content hash mapping is kept
+        """
+        self.root = root
+        self.db = db
+        self.writer = writer or AsyncUploadWriter()
+        self.persist = persist
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        os.makedirs(root, exist_ok=True)
+
+    def _lock_for(self, content_hash: str) -> threading.Lock:
+        return self._locks[int(content_hash[:8], 16) % LOCK_STRIPES]
+
+    def path_for(self, content_hash: str) -> str:
+        """Where the blob for a content hash lives"""
+        shards = [content_hash[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_DEPTH)]
+        return os.path.join(self.root, *shards, f'{content_hash}.pdf')
+
+    def put(self, data: bytes, content_hash: str, filename: str = None) -> str:
+        """
+        Record an upload and store its bytes unless an identical file exists
+
+        Returns:
+            The new upload id
+        """
+        upload_id = uuid.uuid4().hex
+        with self._lock_for(content_hash):
+            new_blob = self.db.add_upload(upload_id, content_hash, filename, len(data))
+            if self.persist:
+                path = self.path_for(content_hash)
+                if new_blob or not os.path.exists(path):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    self.writer.write(path, data)
+        return upload_id
+
+    def get(self, upload_id: str) -> Optional[Dict]:
+        """Upload record (id, content_hash, filename, created_at), or None"""
+        return self.db.get_upload(upload_id)
+
+    def open_path(self, content_hash: str) -> Optional[str]:
+        """Path of a stored blob once any pending write has landed, or None"""
+        path = self.path_for(content_hash)
+        self.writer.wait(path)
+        return path if os.path.exists(path) else None
+
+    def release(self, upload_id: str) -> bool:
+        """
+        Drop an upload; the blob is deleted with its last reference
+
+        Returns:
+            False if the upload id is unknown
+        """
+        upload = self.db.get_upload(upload_id)
+        if upload is None:
+            return False
+        with self._lock_for(upload['content_hash']):
+            released = self.db.delete_upload(upload_id)
+            if released is None:
+                return False
+            content_hash, remaining = released
+            if remaining == 0:
+                path = self.path_for(content_hash)
+                self.writer.wait(path)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return True
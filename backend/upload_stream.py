@@ -0,0 +1,70 @@
+"""
+In-memory upload ingestion with optional background persistence
+"""
+import atexit
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+def read_upload_stream(stream) -> Tuple[bytes, str]:
+    """
+    Read an uploaded file into memory, hashing it as the chunks arrive
+
+    Args:
+        stream: File-like request stream (e.g. FileStorage.stream)
+
+    Returns:
+        Tuple of (raw bytes, SHA-256 hex digest)
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b''.join(chunks), digest.hexdigest()
+
+class AsyncUploadWriter:
+    """
+    Writes uploaded PDFs to disk on a background thread so parsing
+    never waits on the write.
+    """
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upload-writer')
+        self._pending = {}
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def write(self, filepath: str, data: bytes):
+        """Queue a write of data to filepath"""
+        with self._lock:
+            future = self._executor.submit(self._write, filepath, data)
+            self._pending[filepath] = future
+        future.add_done_callback(lambda f: self._forget(filepath, f))
+        return future
+
+    def wait(self, filepath: str):
+        """Block until any queued write to filepath has finished"""
+        with self._lock:
+            future = self._pending.get(filepath)
+        if future is not None:
+            future.result()
+
+    def _write(self, filepath: str, data: bytes):
+        # Write to a temp name and rename, so readers never see a partial file
+        tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+
+    def _forget(self, filepath: str, future):
+        with self._lock:
+            if self._pending.get(filepath) is future:
+                del self._pending[filepath]
+
+    def shutdown(self):
+        """Finish queued writes and stop the writer thread"""
+        self._executor.shutdown(wait=True)
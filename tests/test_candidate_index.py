@@ -0,0 +1,52 @@
+import pytest
+
+from backend.candidate_index import CandidatePool
+from backend.job_catalog import JobCatalog
+from backend.job_matcher import JobMatcher
+from backend.skill_taxonomy import TaxonomyStore
+
+JOB = {'id': 1, 'title': 'Backend Engineer', 'company_id': 1,
+       'required_skills': ['python', 'django'], 'preferred_skills': ['docker']}
+OTHER_JOB = {'id': 2, 'title': 'Frontend Engineer', 'company_id': 1,
+             'required_skills': ['react', 'css'], 'preferred_skills': ['typescript']}
+
+def _analysis(analysis_id, skills, content_hash):
+    return {'id': analysis_id, 'filename': 'resume.pdf', 'extracted_skills': skills,
+            'user_id': None, 'created_at': '2026-01-01', 'content_hash': content_hash}
+
+@pytest.fixture
+def setup():
+    taxonomy_store = TaxonomyStore(check_interval=0)
+    taxonomy = taxonomy_store.current()
+    catalog = JobCatalog([JOB, OTHER_JOB], taxonomy.skill_index)
+    return JobMatcher(taxonomy_store), catalog, taxonomy
+
+@pytest.mark.parametrize('same_batch', [False, True])
+def test_reanalysed_resume_is_scored_on_its_new_skills(setup, same_batch):
+    matcher, catalog, taxonomy = setup
+    first = _analysis(1, ['python', 'react'], 'hash-a')
+    second = _analysis(2, ['python', 'django', 'docker'], 'hash-a')
+    other = _analysis(3, ['css'], 'hash-b')
+
+    keys = {}
+    pool = CandidatePool(taxonomy.fingerprint)
+    if same_batch:
+        pool = pool.extended([first, second, other], taxonomy.skill_index, keys)
+    else:
+        pool = pool.extended([first, other], taxonomy.skill_index, keys)
+        pool = pool.extended([second], taxonomy.skill_index, keys)
+    assert len(pool) == 2
+
+    ranked, _ = matcher.rank_candidates(JOB, pool, catalog)
+    score, row, matched_required, matched_preferred, _ = ranked[0]
+    assert pool.candidates[row].analysis_id == 2
+    assert (matched_required, matched_preferred) == (2, 1)
+
+    forward, _ = matcher.rank_catalog(second['extracted_skills'], catalog)
+    forward_score = next(s for s, index, *_ in forward if catalog.jobs[index].job['id'] == JOB['id'])
+    assert score == pytest.approx(forward_score, abs=0.011)
+
+    # The old skills no longer count towards another job
+    ranked, _ = matcher.rank_candidates(OTHER_JOB, pool, catalog)
+    by_row = {row: matched_required for _, row, matched_required, _, _ in ranked}
+    assert by_row[row] == 0
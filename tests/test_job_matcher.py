@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from backend.job_catalog import JobCatalog
+from backend.job_matcher import JobMatcher
+from backend.skill_taxonomy import TaxonomyStore
+
+@pytest.fixture(scope='module')
+def taxonomy_store():
+    return TaxonomyStore(check_interval=0)
+
+@pytest.fixture(scope='module')
+def catalog(taxonomy_store):
+    taxonomy = taxonomy_store.current()
+    skills = sorted(taxonomy.technical_skills)
+    rng = random.Random(7)
+    jobs = [{'id': i + 1, 'title': f'Job {i}', 'company_id': 1 + i % 3,
+             'required_skills': rng.sample(skills, 6), 'preferred_skills': rng.sample(skills, 4)}
+            for i in range(120)]
+    return JobCatalog(jobs, taxonomy.skill_index)
+
+def test_calculate_match_score_agrees_with_catalog_ranking(taxonomy_store, catalog):
+    matcher = JobMatcher(taxonomy_store)
+    rng = random.Random(11)
+    skills = sorted(taxonomy_store.current().technical_skills)
+    for _ in range(10):
+        resume_skills = rng.sample(skills, 8)
+        ranked, _ = matcher.rank_catalog(resume_skills, catalog)
+        assert ranked
+        for score, index, *_ in ranked:
+            job = catalog.jobs[index].job
+            result = matcher.calculate_match_score(resume_skills, job['required_skills'],
+                                                   job['preferred_skills'], catalog=catalog)
+            assert result['overall_score'] == pytest.approx(score, abs=0.011)
+
+@pytest.mark.parametrize('max_cells', [1, 250, 10_000_000])
+def test_rank_batch_matches_rank_catalog_for_any_chunking(taxonomy_store, catalog, max_cells):
+    matcher = JobMatcher(taxonomy_store)
+    rng = random.Random(3)
+    skills = sorted(taxonomy_store.current().technical_skills)
+    resumes = [rng.sample(skills, 8) for _ in range(7)]
+    batch = list(matcher.rank_batch(resumes, catalog, top_k=5, max_cells=max_cells))
+    assert batch == [matcher.rank_catalog(resume_skills, catalog, top_k=5) for resume_skills in resumes]
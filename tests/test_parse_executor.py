@@ -0,0 +1,48 @@
+import threading
+import time
+
+import pytest
+
+from backend import parse_executor
+from backend.parse_executor import ParseBusyError, ParseExecutor, ParseTimeoutError
+
+def _sleep_parse(source, max_pages, parallel_threshold, backend):
+    """Stand-in for _parse_document: 'parses' for `source` seconds"""
+    time.sleep(float(source))
+    return 1, f'parsed {source}'
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(parse_executor, '_parse_document', _sleep_parse)
+    executor = ParseExecutor(pool_size=1, timeout=2)
+    # Spawn the worker up front so process start-up does not skew the timings
+    executor.parse('0')
+    yield executor
+    executor.shutdown()
+
+def _parse_concurrently(executor, sources):
+    outcomes = [None] * len(sources)
+
+    def run(i, source):
+        try:
+            outcomes[i] = executor.parse(source)
+        except Exception as e:
+            outcomes[i] = e
+
+    threads = [threading.Thread(target=run, args=(i, source)) for i, source in enumerate(sources)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+def test_queue_wait_is_not_charged_to_parse_budget(executor):
+    # The second document waits ~1.5s for the only worker, then parses within its 2s budget
+    outcomes = _parse_concurrently(executor, ['1.5', '1.5'])
+    assert outcomes == ['parsed 1.5', 'parsed 1.5']
+
+def test_saturated_pool_reports_busy_not_timeout(executor):
+    outcomes = _parse_concurrently(executor, ['1.5', '1.5', '1.5'])
+    assert not any(isinstance(outcome, ParseTimeoutError) for outcome in outcomes)
+    assert any(isinstance(outcome, ParseBusyError) for outcome in outcomes)
+    assert outcomes.count('parsed 1.5') >= 1
@@ -0,0 +1,19 @@
+from backend.resume_parser import ResumeParser
+from backend.skill_extractor import SkillExtractor
+
+LIST_ONLY_SKILLS = {'go', 'kubernetes', 'postgresql'}
+
+def _skills(text):
+    spans = ResumeParser().find_section_spans(text)
+    return set(SkillExtractor().extract_skills(text, spans)), spans
+
+def test_core_competencies_header_list():
+    skills, spans = _skills("Jane Doe\nCore Competencies\nGolang, K8s, Postgres\n")
+    assert spans['skills']
+    assert LIST_ONLY_SKILLS <= skills
+
+def test_competencies_header_filed_under_another_section_falls_back():
+    # 'profile' is the leftmost header word, so the parser files this as summary
+    skills, spans = _skills("Jane Doe\nProfile and Core Competencies\nGolang, K8s, Postgres\n")
+    assert not spans['skills']
+    assert LIST_ONLY_SKILLS <= skills
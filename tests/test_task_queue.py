@@ -0,0 +1,30 @@
+import os
+
+from backend.database import Database
+from backend.task_queue import TaskQueue
+
+def test_exhausted_task_releases_spooled_upload(tmp_path):
+    db = Database(str(tmp_path / 'tasks.db'))
+    spooled = tmp_path / 'spooled.pdf'
+    spooled.write_bytes(b'%PDF-1.4')
+    # stale_after < 0: a running task counts as abandoned at once, as if its worker died
+    task_queue = TaskQueue(db, stale_after=-1, max_attempts=1)
+    task_id = task_queue.enqueue('upload', {'path': str(spooled), 'spooled': True})
+
+    assert task_queue.claim()['id'] == task_id
+    assert task_queue.claim() is None
+
+    task = task_queue.get(task_id)
+    assert task['status'] == 'failed'
+    assert not os.path.exists(spooled)
+
+def test_exhausted_task_keeps_stored_upload(tmp_path):
+    db = Database(str(tmp_path / 'tasks.db'))
+    stored = tmp_path / 'stored.pdf'
+    stored.write_bytes(b'%PDF-1.4')
+    task_queue = TaskQueue(db, stale_after=-1, max_attempts=1)
+    task_queue.enqueue('upload', {'path': str(stored), 'spooled': False})
+
+    task_queue.claim()
+    assert task_queue.claim() is None
+    assert os.path.exists(stored)